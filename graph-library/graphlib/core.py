@@ -1,95 +1,164 @@
 """
 core.py
 
-Defines the Graph class and the DisjointSet (Union-Find) data structure.
+Defines the Graph and FrozenGraph classes and the DisjointSet (Union-Find) data structure.
 
 Graph:
     - Supports both directed and undirected graphs
     - Supports both weighted and unweighted edges
+    - Node keys are converted with str() by default; native_keys=True keeps hashable keys as given, but
+      they must be mutually orderable (nodes are reported in sorted order), so e.g. 1 and "a" cannot be mixed
     - Provides methods for node/edge manipulation, adjacency matrix/list, and edge list generation
+    - Maintains an incoming-edge index for constant-time in_degree and predecessor lookups
+    - Bulk constructors (add_nodes_from, add_edges_from, remove_edges_from, Graph.from_edges) for large inputs;
+      edge batches are validated up front (NumPy arrays by dtype) and fill each adjacency row with one update
+    - Tracks a mutation version; derived views (node order, edge list, adjacency matrix) are cached until it changes
+    - Exports NumPy dense and sparse (COO/CSR) adjacency arrays in sorted node order
     - Includes visual string representation of graph data
+    - Can be frozen into an immutable, array-backed FrozenGraph
+    - connected, component_count and component_of answer (weakly) connected component queries through a
+      DisjointSet; track_components=True keeps it live as nodes and edges are added, rebuilding lazily
+      only after a removal, instead of rebuilding it after every change
+
+FrozenGraph:
+    - Immutable compressed sparse row (CSR) form of a Graph
+    - Nodes are numbered 0..V-1 in sorted order; offsets, targets and weights are NumPy arrays
+    - Exposes the same read-only methods as Graph, so the algorithms in graphlib.extras accept it directly
+    - get_csr_views() hands out the CSR arrays as memoryviews, which index to Python ints/floats without
+      copying; the algorithms in graphlib.extras use it to run on integer node ids and only convert to
+      node names for their results
+    - Node lookups on a memory-mapped name table binary search the sorted table in place instead of copying it
 
 DisjointSet:
-    - Implements Union-Find with path compression and rank heuristics
+    - Implements Union-Find with iterative path halving and union by size
+    - Keeps a live count of disjoint sets; compact=True stores parents and sizes in typed arrays
+    - Can grow one element at a time with add()
     - Useful for graph algorithms like Kruskal's MST
+
+IndexedHeap:
+    - Binary min-heap over integer ids 0..n-1 with an index table for O(log n) decrease-key
+    - Holds each id at most once, so the heap never grows past n entries (used by Prim's MST)
 """
 
 
+import numpy as np
+from array import array
+from collections.abc import Mapping
+from bisect import bisect_left
+from itertools import chain, islice
+from numbers import Integral, Real
+from operator import eq
 from typing import List, Tuple
 
 class Graph:
 
-    def __init__(self, title="Graph", directed: bool=False, weighted: bool=False):
+    INFO_SECTIONS = ("nodes", "adjacency_list", "adjacency_matrix", "edge_list")
+
+    def __init__(self, title="Graph", directed: bool=False, weighted: bool=False, native_keys: bool=False,
+                 track_components: bool=False):
         # Flags
         self.directed = directed
         self.weighted = weighted
+        self.native_keys = native_keys   # Keep node keys as given instead of converting them with str()
+        self.track_components = track_components   # Maintain components on every add instead of on demand
 
         # Fields
         self.title = title
         self.nodes = set()
         self.adj_list = {}
+        self.in_adj_list = {} if directed else self.adj_list   # Incoming edges; undirected graphs share adj_list
         self.negative_weights = 0
+
+        # Mutation tracking; derived views are cached until the next change
+        self.version = 0
+        self._edge_count = 0
+        self._cache = {}
+        self._components = (DisjointSet(0), {}, []) if track_components else None   # None until (re)built
+
+    @classmethod
+    def from_edges(cls, edges, weights=None, title="Graph", directed: bool=False, weighted: bool=False,
+                   native_keys: bool=False, nodes=None, track_components: bool=False) -> "Graph":
+        graph = cls(title, directed=directed, weighted=weighted, native_keys=native_keys,
+                    track_components=track_components)
+        if nodes is not None:
+            graph.add_nodes_from(nodes)
+        graph.add_edges_from(edges, weights)
+        return graph
     
     def __str__(self):
-        lines = []
+        return "\n".join(self.info_lines())
+
+    def info_lines(self, sections=None, max_matrix_order: int=None):
+        # Yields the text report one line at a time; sections picks which parts to include
+        # and the adjacency matrix is skipped when the graph has more than max_matrix_order nodes
+        if sections is None:
+            sections = Graph.INFO_SECTIONS
+        unknown = set(sections) - set(Graph.INFO_SECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown sections {sorted(unknown)}, expected some of {list(Graph.INFO_SECTIONS)}")
+
         indent = "   "
-        divider = ""
         divider = "=" * 90
         def header(text):
-            lines.append(divider)
-            lines.append(text)
-            lines.append(divider)
-
-        lines.append(divider)
-        lines.append(f"\"{self.title}\"")
-        lines.append("Directed, ") if self.directed else lines.append("Undirected, ")
-        lines[2] = lines[2] + "Weighted" if self.weighted else lines[2] + "Unweighted"
-        lines.append(divider)
-        lines.append("")
-
-        lines.append("Nodes:")
-        nodes = sorted(self.nodes)
-        lines.append(f"{nodes}\n")
-
-        header("Adjacency List")
-        for source_node, neighbor in sorted(self.adj_list.items()):
-            lines.append(f"{indent}Node {source_node}:")
-            if not neighbor:
-                lines.append(f"{indent}{indent}No adjacencies")
-            for dest_node, weight in sorted(self.adj_list[source_node].items()):
-                lines.append(f"{indent}{indent}Node {dest_node}, Weight: {weight}")
-        lines.append("")
-        
-        header("Adjacency Matrix")
-        lines.append("")
+            return [divider, text, divider]
 
-        # Add column headers
-        lines.append("-" * 6 + ("-" * 5) * (len(nodes)))
-        lines.append(" " * 6 + "".join(f"{node:>5}" for node in nodes))
-        lines.append("-" * 6 + ("-" * 5) * (len(nodes)))
+        yield divider
+        yield f"\"{self.title}\""
+        yield ("Directed, " if self.directed else "Undirected, ") + ("Weighted" if self.weighted else "Unweighted")
+        yield divider
+        yield ""
 
-        # Add rows with row headers and matrix values
-        matrix = self.get_adj_matrix()
-        for i, row in enumerate(matrix):
-            lines.append(f"{indent}{nodes[i]} |" + "".join(f"{value:>5}" for value in row))
-        lines.append("")
+        nodes = self.get_node_order()
+        if "nodes" in sections:
+            yield "Nodes:"
+            yield f"{nodes}\n"
 
-        if not self.directed:
-            header("Edge List\nUndirected graph: edges are bidirectional")
-        else:
-            header("Edge List")
-        lines.append("")
-        lines.append("-" * 35)
-        if self.directed:
-            lines.append(f"{'Source':>10}{'Destination':>15}{'Weight':>10}")
-        else:
-            lines.append(f"{'Node':>10}{'Node':>15}{'Weight':>10}")
-        lines.append("-" * 35)
-        for edge in sorted(self.get_edge_list(), key=lambda x: (x[0], x[1], x[2])):
-            source, destination, weight = edge
-            lines.append(f"{source:>10}{destination:>15}{weight:>10}")
+        if "adjacency_list" in sections:
+            yield from header("Adjacency List")
+            for source_node in nodes:
+                neighbors = self.adj_list[source_node]
+                yield f"{indent}Node {source_node}:"
+                if not neighbors:
+                    yield f"{indent}{indent}No adjacencies"
+                for dest_node, weight in sorted(neighbors.items()):
+                    yield f"{indent}{indent}Node {dest_node}, Weight: {weight}"
+            yield ""
+        
+        if "adjacency_matrix" in sections:
+            yield from header("Adjacency Matrix")
+            yield ""
+
+            if max_matrix_order is not None and len(nodes) > max_matrix_order:
+                yield f"{indent}Skipped: {len(nodes)} nodes exceeds the limit of {max_matrix_order}"
+            else:
+                # Add column headers
+                yield "-" * 6 + ("-" * 5) * (len(nodes))
+                yield " " * 6 + "".join(f"{node:>5}" for node in nodes)
+                yield "-" * 6 + ("-" * 5) * (len(nodes))
+
+                # Add rows with row headers and matrix values, one row at a time
+                node_index = self.get_node_index()
+                for source_node in nodes:
+                    row = [0] * len(nodes)
+                    for dest_node, weight in self.adj_list[source_node].items():
+                        row[node_index[dest_node]] = weight
+                    yield f"{indent}{source_node} |" + "".join(f"{value:>5}" for value in row)
+            yield ""
 
-        return "\n".join(lines)
+        if "edge_list" in sections:
+            if not self.directed:
+                yield from header("Edge List\nUndirected graph: edges are bidirectional")
+            else:
+                yield from header("Edge List")
+            yield ""
+            yield "-" * 35
+            if self.directed:
+                yield f"{'Source':>10}{'Destination':>15}{'Weight':>10}"
+            else:
+                yield f"{'Node':>10}{'Node':>15}{'Weight':>10}"
+            yield "-" * 35
+            for source, destination, weight in sorted(self.get_edge_list(), key=lambda x: (x[0], x[1], x[2])):
+                yield f"{source:>10}{destination:>15}{weight:>10}"
         
 
     # Helper functions
@@ -98,52 +167,67 @@ class Graph:
         return len(self.nodes)
     
     def num_edges(self) -> int:
-        return len(self.get_edge_list())
+        return self._edge_count
     
     def has_node(self, node: str) -> bool:
-        node = str(node)
-        return node in self.nodes
+        if not self.native_keys: node = str(node)
+        return node in self.adj_list
+
+    def resolve_node(self, node: str) -> str:
+        # The key the graph stores node under (str unless native_keys); raises if there is no such node
+        if not self.native_keys: node = str(node)
+        if not self.has_node(node):
+            raise ValueError(f"'{node}' not found in '{self.title}'")
+        return node
 
     def has_edge(self, source_node: str, dest_node: str) -> bool:
-        source_node = str(source_node)
-        dest_node = str(dest_node)
+        if not self.native_keys:
+            source_node = str(source_node)
+            dest_node = str(dest_node)
 
-        if (not self.has_node(source_node)):
+        neighbors = self.adj_list.get(source_node)
+        if neighbors is None:
             raise ValueError(f"'{source_node}' not found in '{self.title}'")
-        if (not self.has_node(dest_node)):
+        if dest_node not in self.adj_list:
             raise ValueError(f"'{dest_node}' not found in '{self.title}'")
             
-        return dest_node in self.adj_list[source_node]
+        return dest_node in neighbors
 
     def degree(self, node: str) -> int:
-        node = str(node)
-        if self.has_node(node):
-            return len(self.adj_list[node])
+        if not self.native_keys: node = str(node)
+        neighbors = self.adj_list.get(node)
+        if neighbors is not None:
+            return len(neighbors)
         raise ValueError(f"'{node}' not found in '{self.title}'")
 
     def in_degree(self, node: str) -> int:
-        node = str(node)
-        counter = 0
-        if self.has_node(node):
-            for source_node, neighbor in self.adj_list.items():
-                for dest_node, weight in neighbor.items():
-                    if str(dest_node) == node:
-                        counter += 1
-            return counter
+        if not self.native_keys: node = str(node)
+        predecessors = self.in_adj_list.get(node)
+        if predecessors is not None:
+            return len(predecessors)
         raise ValueError(f"'{node}' not found in '{self.title}'")
 
     def out_degree(self, node: str) -> int:
         return self.degree(node)
 
     def get_neighbors(self, node: str) -> set:
-        node = str(node)
-        if self.has_node(node):
-            return set(self.adj_list[node].keys())
+        if not self.native_keys: node = str(node)
+        neighbors = self.adj_list.get(node)
+        if neighbors is not None:
+            return set(neighbors)
+        raise ValueError(f"'{node}' not found in '{self.title}'")
+
+    def get_predecessors(self, node: str) -> set:
+        if not self.native_keys: node = str(node)
+        predecessors = self.in_adj_list.get(node)
+        if predecessors is not None:
+            return set(predecessors)
         raise ValueError(f"'{node}' not found in '{self.title}'")
 
     def get_weight(self, source_node: str, dest_node: str) -> int:
-        source_node = str(source_node)
-        dest_node = str(dest_node)
+        if not self.native_keys:
+            source_node = str(source_node)
+            dest_node = str(dest_node)
 
         if not self.has_edge(source_node, dest_node):
             raise ValueError(f"No edge found from {source_node} to {dest_node} in '{self.title}'")
@@ -152,47 +236,112 @@ class Graph:
             return 1   # Unweighted graph means all weights equal 1
         return self.adj_list[source_node][dest_node]
 
+    # Component queries; edge direction is ignored, so directed graphs report weakly connected components
+
+    def connected(self, node_a: str, node_b: str) -> bool:
+        disjoint_set, node_ids, _ = self._component_state()
+        root_a = disjoint_set.find(self._component_id(node_ids, node_a))
+        return root_a == disjoint_set.find(self._component_id(node_ids, node_b))
+
+    def component_count(self) -> int:
+        return self._component_state()[0].count
+
+    def component_of(self, node: str) -> str:
+        # Representative node of the component; it may change as components merge
+        disjoint_set, node_ids, node_names = self._component_state()
+        return node_names[disjoint_set.find(self._component_id(node_ids, node))]
+
+    def _component_id(self, node_ids, node: str) -> int:
+        if not self.native_keys: node = str(node)
+        node_id = node_ids.get(node)
+        if node_id is None:
+            raise ValueError(f"'{node}' not found in '{self.title}'")
+        return node_id
+
+    def _component_state(self):
+        if not self.track_components:
+            return self._cached("components", self._build_components)
+        if self._components is None:
+            self._components = self._build_components()
+        return self._components
+
 
     # Graph construction functions
 
     def add_node(self, node: str) -> None:
-        node = str(node)
-        if not self.has_node(node):
+        if not self.native_keys: node = str(node)
+        if node not in self.adj_list:
+            self._check_orderable([node])
             self.nodes.add(node)
             self.adj_list[node] = {}
+            if self.directed:
+                self.in_adj_list[node] = {}
+            if self._components is not None:
+                self._components[1][node] = self._components[0].add()
+                self._components[2].append(node)
+            self._touch()
 
     def remove_node(self, node: str) -> None:
-        node = str(node)
-        if self.has_node(node):
+        if not self.native_keys: node = str(node)
+        if node in self.adj_list:
             self.nodes.remove(node)
+
+            # Only the node's own neighbors (and predecessors) reference it
+            self._edge_count -= len(self.adj_list[node])
+            for dest_node, weight in self.adj_list[node].items():
+                if weight < 0: self.negative_weights -= 1
+                self.in_adj_list[dest_node].pop(node)
+            if self.directed:
+                self._edge_count -= len(self.in_adj_list[node])
+                for source_node, weight in self.in_adj_list[node].items():
+                    if weight < 0: self.negative_weights -= 1
+                    self.adj_list[source_node].pop(node)
+                del self.in_adj_list[node]
             del self.adj_list[node]
-            for neighbor in self.adj_list:
-                self.adj_list[neighbor].pop(node)
+            self._components = None   # Removals can split components; rebuild on the next query
+            self._touch()
         else:
             raise ValueError(f"'{node}' not found in '{self.title}'")
     
     def add_edge(self, source_node: str, dest_node: str, weight: int=1) -> None:
-        source_node = str(source_node)
-        dest_node = str(dest_node)
+        if not self.native_keys:
+            source_node = str(source_node)
+            dest_node = str(dest_node)
 
         if source_node == dest_node:
             raise ValueError("Self-loops are not allowed.")
-        if (not self.has_node(source_node)):
+        if self.weighted and not isinstance(weight, Real):
+            raise ValueError(f"Edge weights must be real numbers, got {weight!r}")
+        new_nodes = [node for node in (source_node, dest_node) if node not in self.adj_list]
+        if new_nodes:
+            self._check_orderable(new_nodes)
+        if source_node not in self.adj_list:
             self.add_node(source_node)
-        if (not self.has_node(dest_node)):
+        if dest_node not in self.adj_list:
             self.add_node(dest_node)
         
         if not self.weighted: weight = 1
 
+        # Re-adding an existing edge replaces its weight
+        old_weight = self.adj_list[source_node].get(dest_node)
+        if old_weight is None:
+            self._edge_count += 1
+        elif old_weight < 0:
+            self.negative_weights -= 1
+
         if weight < 0: self.negative_weights += 1
         
         self.adj_list[source_node][dest_node] = weight
-        if not self.directed:
-            self.adj_list[dest_node][source_node] = weight
+        self.in_adj_list[dest_node][source_node] = weight
+        if self._components is not None:
+            node_ids = self._components[1]
+            self._components[0].union(node_ids[source_node], node_ids[dest_node])
+        self._touch()
 
     def remove_edge(self, source_node: str, dest_node: str) -> None:
-        source_node = str(source_node)
-        dest_node = str(dest_node)
+        if not self.native_keys:
+            source_node = str(source_node)
+            dest_node = str(dest_node)
 
         if not self.has_edge(source_node, dest_node):
             raise ValueError(f"No edge found from {source_node} to {dest_node} in '{self.title}'")
@@ -200,19 +349,260 @@ class Graph:
         if self.adj_list[source_node][dest_node] < 0: self.negative_weights -= 1
 
         self.adj_list[source_node].pop(dest_node)
-        if not self.directed:
-            self.adj_list[dest_node].pop(source_node)
+        self.in_adj_list[dest_node].pop(source_node)
+        self._edge_count -= 1
+        self._components = None
+        self._touch()
+
+    # Bulk construction functions
+    # Edges may be (u, v) or (u, v, w) tuples or a 2-D NumPy array of them; weights may be a separate column
+
+    def add_nodes_from(self, nodes) -> None:
+        if isinstance(nodes, np.ndarray): nodes = nodes.tolist()
+        if not self.native_keys: nodes = map(str, nodes)
+
+        new_nodes = [node for node in dict.fromkeys(nodes) if node not in self.adj_list]
+        if not new_nodes:
+            return
+        self._check_orderable(new_nodes)
+
+        self.nodes.update(new_nodes)
+        self.adj_list.update((node, {}) for node in new_nodes)
+        if self.directed:
+            self.in_adj_list.update((node, {}) for node in new_nodes)
+        if self._components is not None:
+            disjoint_set, node_ids, node_names = self._components
+            for node in new_nodes:
+                node_ids[node] = disjoint_set.add()
+            node_names.extend(new_nodes)
+        self._touch()
+
+    def add_edges_from(self, edges, weights=None) -> None:
+        # Validate the whole batch before changing anything. Endpoints are numbered by their position in
+        # batch_nodes (the batch's distinct nodes), so rows can be filled by id
+        if isinstance(edges, np.ndarray) and edges.dtype.kind in "iuf":
+            # Integer ids are numbered by np.unique (in order of first appearance, as add_edge would add
+            # them) and converted with str() once per distinct node
+            ids, edge_weights = self._split_edge_array(edges)
+            if np.any(ids[:, 0] == ids[:, 1]):
+                raise ValueError("Self-loops are not allowed.")
+            unique_ids, first, inverse = np.unique(ids, return_index=True, return_inverse=True)
+            appearance = np.argsort(first)
+            position = np.empty_like(appearance)
+            position[appearance] = np.arange(len(appearance))
+            batch_nodes = unique_ids[appearance].tolist()
+            if not self.native_keys: batch_nodes = list(map(str, batch_nodes))
+            inverse = position[inverse.reshape(ids.shape)]
+            source_ids, dest_ids = inverse[:, 0], inverse[:, 1]
+        else:
+            if isinstance(edges, np.ndarray):
+                ids, edge_weights = self._split_edge_array(edges)
+                source_nodes, dest_nodes = ids[:, 0].tolist(), ids[:, 1].tolist()
+            else:
+                edges = list(edges)
+                widths = set(map(len, edges))
+                if len(widths) > 1 or not widths <= {2, 3}:
+                    raise ValueError("Edges must all be (source, destination) or all (source, destination, weight)")
+                source_nodes = [edge[0] for edge in edges]
+                dest_nodes = [edge[1] for edge in edges]
+                edge_weights = [edge[2] for edge in edges] if widths == {3} else None
+
+            if not self.native_keys:
+                source_nodes = list(map(str, source_nodes))
+                dest_nodes = list(map(str, dest_nodes))
+            if any(map(eq, source_nodes, dest_nodes)):
+                raise ValueError("Self-loops are not allowed.")
+            batch_nodes = list(dict.fromkeys(chain.from_iterable(zip(source_nodes, dest_nodes))))
+            batch_index = dict(zip(batch_nodes, range(len(batch_nodes))))
+            source_ids = np.fromiter(map(batch_index.__getitem__, source_nodes), dtype=np.int64,
+                                     count=len(source_nodes))
+            dest_ids = np.fromiter(map(batch_index.__getitem__, dest_nodes), dtype=np.int64, count=len(dest_nodes))
+
+        if weights is None: weights = edge_weights
+        if not self.weighted or weights is None:
+            weight_list = [1] * len(source_ids)
+        else:
+            weight_list = self._check_weights(weights)
+        if len(weight_list) != len(source_ids):
+            raise ValueError("The number of weights must match the number of edges")
+
+        self.add_nodes_from(batch_nodes)
+
+        # Fill whole rows at once, as thaw() does. An undirected edge is written to both rows, with the two
+        # directions interleaved so each row still sees the batch in order and the last weight given wins
+        count_negatives = self.negative_weights > 0 or min(weight_list, default=0) < 0
+        if self.directed:
+            added_edges, negative_weights = self._fill_rows(self.adj_list, batch_nodes, source_ids, dest_ids,
+                                                            weight_list, count_negatives)
+            self._fill_rows(self.in_adj_list, batch_nodes, dest_ids, source_ids, weight_list, False)
+        else:
+            owners = np.empty(2 * len(source_ids), dtype=np.int64)
+            neighbors = np.empty(2 * len(source_ids), dtype=np.int64)
+            owners[0::2] = neighbors[1::2] = source_ids
+            owners[1::2] = neighbors[0::2] = dest_ids
+            arc_weights = [None] * len(owners)
+            arc_weights[0::2] = arc_weights[1::2] = weight_list
+            added_arcs, negative_arcs = self._fill_rows(self.adj_list, batch_nodes, owners, neighbors,
+                                                        arc_weights, count_negatives)
+            added_edges, negative_weights = added_arcs // 2, negative_arcs // 2
+
+        self._edge_count += added_edges
+        self.negative_weights += negative_weights
+        if self._components is not None:
+            disjoint_set, node_ids, _ = self._components
+            batch_components = [node_ids[node] for node in batch_nodes]
+            for source_id, dest_id in zip(source_ids.tolist(), dest_ids.tolist()):
+                disjoint_set.union(batch_components[source_id], batch_components[dest_id])
+        self._touch()
+
+    @staticmethod
+    def _check_weights(weights) -> list:
+        # Numeric arrays are checked once by dtype and plain int/float lists by their set of types;
+        # only other element types are checked one by one
+        if isinstance(weights, np.ndarray):
+            if np.issubdtype(weights.dtype, np.integer) or np.issubdtype(weights.dtype, np.floating):
+                return weights.tolist()
+            weights = weights.tolist()
+        weight_list = list(weights)
+        if not set(map(type, weight_list)) <= {int, float}:
+            for weight in weight_list:
+                if not isinstance(weight, Real):
+                    raise ValueError(f"Edge weights must be real numbers, got {weight!r}")
+        return weight_list
+
+    @staticmethod
+    def _fill_rows(rows: dict, batch_nodes: list, owner_ids: np.ndarray, neighbor_ids: np.ndarray,
+                   weight_list: list, count_negatives: bool) -> Tuple[int, int]:
+        # Writes rows[batch_nodes[owner]][batch_nodes[neighbor]] = weight for every entry, one dict.update
+        # per row; a stable sort groups the entries by row without reordering them within a row.
+        # Returns the number of new entries and the change in negative entries (if counted)
+        order = np.argsort(owner_ids, kind="stable")
+        owners = owner_ids[order]
+        starts = np.flatnonzero(np.diff(owners, prepend=-1))
+        counts = np.diff(starts, append=len(order)).tolist()
+        entries = zip(map(batch_nodes.__getitem__, neighbor_ids[order].tolist()),
+                      map(weight_list.__getitem__, order.tolist()))
+
+        added = negatives = 0
+        for owner, count in zip(owners[starts].tolist(), counts):
+            row = rows[batch_nodes[owner]]
+            size = len(row)
+            if not count_negatives:
+                row.update(islice(entries, count))
+                added += len(row) - size
+                continue
+            group = list(islice(entries, count))
+            keys = dict.fromkeys(key for key, _ in group)
+            negatives -= sum(1 for key in keys if row.get(key, 0) < 0)
+            row.update(group)
+            added += len(row) - size
+            negatives += sum(1 for key in keys if row[key] < 0)
+        return added, negatives
+
+    @staticmethod
+    def _split_edge_array(edges: np.ndarray):
+        # A float (u, v, w) array would turn node ids into floats ('0.0'), so ids and weights are split first
+        if edges.ndim != 2 or edges.shape[1] not in (2, 3):
+            raise ValueError("Edges must all be (source, destination) or all (source, destination, weight)")
+        ids = edges[:, :2]
+        if np.issubdtype(ids.dtype, np.floating):
+            if not np.array_equal(ids, np.round(ids)):
+                raise ValueError("Node ids in a floating-point edge array must be whole numbers")
+            ids = ids.astype(np.int64)
+        column = edges[:, 2] if edges.shape[1] == 3 else None
+        return ids, column
+
+    def remove_edges_from(self, edges) -> None:
+        if isinstance(edges, np.ndarray): edges = self._split_edge_array(edges)[0].tolist()
+
+        pairs = [(edge[0], edge[1]) for edge in edges]
+        if not self.native_keys:
+            pairs = [(str(source_node), str(dest_node)) for source_node, dest_node in pairs]
+        for source_node, dest_node in pairs:
+            if dest_node not in self.adj_list.get(source_node, ()):
+                raise ValueError(f"No edge found from {source_node} to {dest_node} in '{self.title}'")
+
+        removed_edges = 0
+        negative_weights = 0
+        for source_node, dest_node in pairs:
+            weight = self.adj_list[source_node].pop(dest_node, None)
+            if weight is None:
+                continue   # Already removed earlier in this batch
+            self.in_adj_list[dest_node].pop(source_node)
+            removed_edges += 1
+            if weight < 0:
+                negative_weights += 1
+
+        self._edge_count -= removed_edges
+        self.negative_weights -= negative_weights
+        if removed_edges:
+            self._components = None
+        self._touch()
 
     def clear(self) -> None:
         self.nodes.clear()
         self.adj_list.clear()
+        self.in_adj_list.clear()
+        self.negative_weights = 0
+        self._edge_count = 0
+        self._components = (DisjointSet(0), {}, []) if self.track_components else None
+        self._touch()
+
+    def _check_orderable(self, new_nodes) -> None:
+        # Native keys are sorted for every report and array view, so each key must compare with the others
+        if not self.native_keys:
+            return
+        sample = next(iter(self.adj_list), new_nodes[0])
+        for node in new_nodes:
+            try:
+                node < sample
+                sample < node
+            except TypeError:
+                raise ValueError(f"Node {node!r} cannot be ordered against {sample!r}; "
+                                 "native_keys graphs need mutually comparable node keys") from None
+
+    def _touch(self) -> None:
+        self.version += 1
+        if self._cache:
+            self._cache.clear()
+
+    def _cached(self, key: str, build):
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
 
     
     # Graph structure functions
+    # Returned views are cached and shared between callers, so treat them as read-only
+
+    def get_node_order(self) -> List[str]:
+        return self._cached("node_order", lambda: sorted(self.nodes))
+
+    def get_node_index(self) -> dict:
+        return self._cached("node_index", lambda: {node: i for i, node in enumerate(self.get_node_order())})
 
     def get_adj_matrix(self) -> List[List[int]]:
-        nodes_list = sorted(self.nodes)
-        node_index = {node: i for i, node in enumerate(nodes_list)}
+        return self._cached("adj_matrix", self._build_adj_matrix)
+
+    def get_edge_list(self) -> List[Tuple[str, str, int]]:
+        return self._cached("edge_list", self._build_edge_list)
+
+    def get_weight_range(self) -> Tuple[int, int, bool]:
+        # (smallest weight, largest weight, whether every weight is an int); (0, 0, True) without edges
+        return self._cached("weight_range", self._build_weight_range)
+
+    def get_adj_array(self, dtype=None, fill_value=0) -> np.ndarray:
+        return self.freeze().get_adj_array(dtype, fill_value)
+
+    def get_sparse_adj(self, fmt: str="csr") -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self.freeze().get_sparse_adj(fmt)
+
+    def freeze(self) -> "FrozenGraph":
+        return self._cached("frozen", self._build_frozen)
+
+    def _build_adj_matrix(self) -> List[List[int]]:
+        nodes_list = self.get_node_order()
+        node_index = self.get_node_index()
         adj_matrix = [[0 for _ in range(len(nodes_list))] for _ in range(len(nodes_list))]
 
         for source_node, neighbors in self.adj_list.items():
@@ -222,7 +612,13 @@ class Graph:
 
         return adj_matrix
 
-    def get_edge_list(self) -> List[Tuple[str, str, int]]:
+    def _build_weight_range(self) -> Tuple[int, int, bool]:
+        weights = [weight for neighbors in self.adj_list.values() for weight in neighbors.values()]
+        if not weights:
+            return 0, 0, True
+        return min(weights), max(weights), all(type(weight) is int for weight in weights)
+
+    def _build_edge_list(self) -> List[Tuple[str, str, int]]:
         edge_list = []
         visited_edges = set()
 
@@ -234,26 +630,592 @@ class Graph:
                         visited_edges.add((source_node, dest_node))
 
         return edge_list
-    
+
+    def _build_components(self) -> tuple:
+        # (DisjointSet, node -> id, id -> node) over the current edges
+        node_names = list(self.adj_list)
+        node_ids = {node: i for i, node in enumerate(node_names)}
+        disjoint_set = DisjointSet(len(node_names))
+        for source_node, neighbors in self.adj_list.items():
+            source_id = node_ids[source_node]
+            for dest_node in neighbors:
+                disjoint_set.union(source_id, node_ids[dest_node])
+        return disjoint_set, node_ids, node_names
+
+    def _build_frozen(self) -> "FrozenGraph":
+        nodes_list = self.get_node_order()
+        node_index = self.get_node_index()
+        degrees = [len(self.adj_list[node]) for node in nodes_list]
+
+        offsets = np.zeros(len(nodes_list) + 1, dtype=np.int64)
+        np.cumsum(degrees, out=offsets[1:])
+        index_dtype = np.int32 if len(nodes_list) < 2**31 else np.int64
+
+        targets = np.fromiter((node_index[dest_node] for node in nodes_list for dest_node in self.adj_list[node]),
+                              dtype=index_dtype, count=int(offsets[-1]))
+        weight_list = [weight for node in nodes_list for weight in self.adj_list[node].values()]
+        # Only integers keep an int64 array; any other Real (float32, Fraction, bool) would be truncated
+        int_mask = [isinstance(weight, Integral) and not isinstance(weight, bool) for weight in weight_list]
+        weight_dtype = np.int64 if all(int_mask) else np.float64
+        weights = np.array(weight_list, dtype=weight_dtype)
+
+        # Remember what sorting throws away so thaw() can rebuild this exact Graph: the order nodes
+        # were added, each edge's position in its row and which weights were ints among floats
+        insertion_order = np.fromiter((node_index[node] for node in self.adj_list), dtype=np.int64,
+                                      count=len(nodes_list))
+        row_positions = np.arange(len(targets)) - np.repeat(offsets[:-1], degrees)
+        int_weights = None
+        if weight_dtype == np.float64 and any(int_mask):
+            int_weights = np.array(int_mask, dtype=bool)
+
+        # Sort each row by target id so rows can be binary searched
+        rows = np.repeat(np.arange(len(nodes_list)), degrees)
+        order = np.lexsort((targets, rows))
+        targets, weights, row_positions = targets[order], weights[order], row_positions[order]
+        if int_weights is not None:
+            int_weights = int_weights[order]
+
+        # The arrays are handed out without copying, so lock them
+        for array in (offsets, targets, weights, insertion_order, row_positions, int_weights):
+            if array is not None:
+                array.flags.writeable = False
+
+        return FrozenGraph(self.title, self.directed, self.weighted, nodes_list, offsets, targets, weights,
+                           self.negative_weights, self.native_keys, insertion_order, row_positions, int_weights)
+
+
+class _CSRRow(Mapping):
+    # Read-only {neighbor: weight} view over one row of a FrozenGraph
+
+    def __init__(self, graph: "FrozenGraph", node_id: int):
+        self._graph = graph
+        self._start = int(graph.offsets[node_id])
+        self._end = int(graph.offsets[node_id + 1])
+
+    def __getitem__(self, node):
+        i = self._find(node)
+        if i < 0:
+            raise KeyError(node)
+        return self._graph.weights[i].item()
+
+    def __contains__(self, node) -> bool:
+        return self._find(node) >= 0
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def _find(self, node) -> int:
+        node_id = self._graph.node_ids.get(node)
+        if node_id is None:
+            return -1
+        row = self._graph.targets[self._start:self._end]
+        i = int(np.searchsorted(row, node_id))
+        if i < len(row) and row[i] == node_id:
+            return self._start + i
+        return -1
+
+    def keys(self) -> list:
+        names = self._graph.node_names
+        return [names[t] for t in self._graph.targets[self._start:self._end].tolist()]
+
+    def values(self) -> list:
+        return self._graph.weights[self._start:self._end].tolist()
+
+    def items(self) -> list:
+        return list(zip(self.keys(), self.values()))
+
+
+class _CSRAdjacency(Mapping):
+    # Read-only {node: {neighbor: weight}} view over a FrozenGraph, mirroring Graph.adj_list
+
+    def __init__(self, graph: "FrozenGraph"):
+        self._graph = graph
+
+    def __getitem__(self, node) -> _CSRRow:
+        return _CSRRow(self._graph, self._graph.node_ids[node])
+
+    def __contains__(self, node) -> bool:
+        return node in self._graph.node_ids
+
+    def __iter__(self):
+        return iter(self._graph.node_names)
+
+    def __len__(self) -> int:
+        return len(self._graph.node_names)
+
+    def items(self) -> list:
+        return [(node, _CSRRow(self._graph, i)) for i, node in enumerate(self._graph.node_names)]
+
+
+class _SortedIndex(Mapping):
+    # Read-only {node: id} view over a sorted name table, found by binary search instead of a dict so
+    # memory-mapped tables are never copied; tables with a find(node) method search themselves
+
+    def __init__(self, names):
+        self._names = names
+        self._find = getattr(names, "find", None)
+
+    def __getitem__(self, node) -> int:
+        if self._find is not None:
+            i = self._find(node)
+        else:
+            try:
+                i = bisect_left(self._names, node)
+            except TypeError:
+                i = -1   # Not comparable with the stored keys, so not among them
+            if i >= len(self._names) or self._names[i] != node:
+                i = -1
+        if i < 0:
+            raise KeyError(node)
+        return i
+
+    def __contains__(self, node) -> bool:
+        try:
+            self[node]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+class FrozenGraph:
+
+    def __init__(self, title, directed: bool, weighted: bool, node_names, offsets, targets, weights,
+                 negative_weights: int=0, native_keys: bool=False, insertion_order=None, row_positions=None,
+                 int_weights=None):
+        # Flags
+        self.directed = directed
+        self.weighted = weighted
+        self.native_keys = native_keys
+
+        # Fields
+        self.title = title
+        self.negative_weights = negative_weights
+        self.node_names = node_names
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.adj_list = _CSRAdjacency(self)
+
+        # Optional layout of the Graph this was frozen from, used by thaw() to restore it exactly:
+        # node ids in insertion order, each entry's position within its row, and a mask of entries
+        # whose weight was an int before a float in the same graph promoted the array to float64
+        self.insertion_order = insertion_order
+        self.row_positions = row_positions
+        self.int_weights = int_weights
+
+        # File the arrays are memory-mapped from (set by utils.load_mapped), so other processes can map it too
+        self.mapped_path = None
+
+        # Frozen graphs never change, so derived views are cached for good
+        self.version = 0
+        self._cache = {}
+
+        # Lazily built lookups
+        self._node_ids = None
+        self._reverse = None
+
+    @classmethod
+    def from_coo(cls, node_names, sources, targets, weights=None, title="Graph", directed: bool=False,
+                 weighted: bool=False, native_keys: bool=False) -> "FrozenGraph":
+        # Builds the CSR form straight from edge arrays of indices into node_names, without an
+        # intermediate Graph; a repeated edge replaces the earlier one, as with add_edge
+        n = len(node_names)
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        if weights is None or not weighted:
+            weights = np.ones(len(sources), dtype=np.int64)
+        weights = np.asarray(weights)
+        if np.any(sources == targets):
+            raise ValueError("Self-loops are not allowed.")
+
+        # Renumber nodes into sorted order
+        try:
+            name_order = sorted(range(n), key=node_names.__getitem__)
+        except TypeError:
+            raise ValueError("Node keys must be mutually comparable to build a FrozenGraph") from None
+        rank = np.empty(n, dtype=np.int64)
+        rank[name_order] = np.arange(n)
+        node_names = [node_names[i] for i in name_order]
+        sources, targets = rank[sources], rank[targets]
+        if not directed:
+            sources, targets = np.minimum(sources, targets), np.maximum(sources, targets)
+
+        # Keep the last occurrence of every edge
+        keys = sources * n + targets
+        order = np.lexsort((np.arange(len(keys)), keys))
+        last = np.ones(len(order), dtype=bool)
+        last[:-1] = keys[order[1:]] != keys[order[:-1]]
+        keep = order[last]
+        sources, targets, weights = sources[keep], targets[keep], weights[keep]
+        negative_weights = int(np.count_nonzero(weights < 0))
+
+        if not directed:
+            sources, targets = np.concatenate((sources, targets)), np.concatenate((targets, sources))
+            weights = np.concatenate((weights, weights))
+
+        order = np.lexsort((targets, sources))
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n), out=offsets[1:])
+        targets = targets[order].astype(np.int32 if n < 2**31 else np.int64)
+        weights = weights[order]
+        for array in (offsets, targets, weights):
+            array.flags.writeable = False
+
+        return cls(title, directed, weighted, node_names, offsets, targets, weights, negative_weights, native_keys)
+
+    __str__ = Graph.__str__
+    info_lines = Graph.info_lines
+    resolve_node = Graph.resolve_node
+    _cached = Graph._cached
+    connected = Graph.connected
+    component_count = Graph.component_count
+    component_of = Graph.component_of
+    _component_id = Graph._component_id
+
+    @property
+    def node_ids(self) -> Mapping:
+        # A dict for in-memory names; lazily loaded tables are binary searched in place
+        if self._node_ids is None:
+            if isinstance(self.node_names, list):
+                self._node_ids = {node: i for i, node in enumerate(self.node_names)}
+            else:
+                self._node_ids = _SortedIndex(self.node_names)
+        return self._node_ids
+
+    @property
+    def nodes(self):
+        return self.node_ids.keys()
+
+    @property
+    def in_adj_list(self) -> _CSRAdjacency:
+        return self.reverse().adj_list
+
+    def nbytes(self) -> int:
+        return self.offsets.nbytes + self.targets.nbytes + self.weights.nbytes
+
+
+    # Helper functions
+
+    def order(self) -> int:
+        return len(self.node_names)
+
+    def num_edges(self) -> int:
+        if self.directed:
+            return len(self.targets)
+        return len(self.targets) // 2
+
+    def has_node(self, node: str) -> bool:
+        if not self.native_keys: node = str(node)
+        return node in self.node_ids
+
+    def has_edge(self, source_node: str, dest_node: str) -> bool:
+        if not self.native_keys:
+            source_node = str(source_node)
+            dest_node = str(dest_node)
+
+        if source_node not in self.node_ids:
+            raise ValueError(f"'{source_node}' not found in '{self.title}'")
+        if dest_node not in self.node_ids:
+            raise ValueError(f"'{dest_node}' not found in '{self.title}'")
+
+        return dest_node in self.adj_list[source_node]
+
+    def degree(self, node: str) -> int:
+        if not self.native_keys: node = str(node)
+        node_id = self.node_ids.get(node)
+        if node_id is not None:
+            return int(self.offsets[node_id + 1] - self.offsets[node_id])
+        raise ValueError(f"'{node}' not found in '{self.title}'")
+
+    def in_degree(self, node: str) -> int:
+        if not self.directed:
+            return self.degree(node)
+        return self.reverse().degree(node)
+
+    def out_degree(self, node: str) -> int:
+        return self.degree(node)
+
+    def get_neighbors(self, node: str) -> set:
+        if not self.native_keys: node = str(node)
+        if node in self.node_ids:
+            return set(self.adj_list[node].keys())
+        raise ValueError(f"'{node}' not found in '{self.title}'")
+
+    def get_predecessors(self, node: str) -> set:
+        return self.reverse().get_neighbors(node)
+
+    def get_weight(self, source_node: str, dest_node: str) -> int:
+        if not self.native_keys:
+            source_node = str(source_node)
+            dest_node = str(dest_node)
+
+        if not self.has_edge(source_node, dest_node):
+            raise ValueError(f"No edge found from {source_node} to {dest_node} in '{self.title}'")
+
+        if not self.weighted:
+            return 1
+        return self.adj_list[source_node][dest_node]
+
+
+    # Graph structure functions
+
+    def get_node_order(self) -> List[str]:
+        # Shared and read-only; a lazily loaded name table is returned as is rather than copied
+        return self.node_names
+
+    def get_node_index(self) -> Mapping:
+        return self.node_ids
+
+    def get_adj_matrix(self) -> List[List[int]]:
+        return self._cached("adj_matrix", lambda: self.get_adj_array().tolist())
+
+    def get_edge_list(self) -> List[Tuple[str, str, int]]:
+        return self._cached("edge_list", self._build_edge_list)
+
+    def get_weight_range(self) -> Tuple[int, int, bool]:
+        if len(self.weights) == 0:
+            return 0, 0, True
+        return self._cached("weight_range", lambda: (self.weights.min().item(), self.weights.max().item(),
+                                                     bool(np.issubdtype(self.weights.dtype, np.integer))))
+
+    def _component_state(self) -> tuple:
+        return self._cached("components", self._build_components)
+
+    def _build_components(self) -> tuple:
+        disjoint_set = DisjointSet(self.order())
+        sources, targets = self.get_sources(), self.targets
+        if not self.directed:
+            keep = sources < targets
+            sources, targets = sources[keep], targets[keep]
+        for source_id, dest_id in zip(sources.tolist(), targets.tolist()):
+            disjoint_set.union(source_id, dest_id)
+        return disjoint_set, self.node_ids, self.node_names
+
+    def get_csr_views(self, weights: np.ndarray=None) -> Tuple[memoryview, memoryview, memoryview]:
+        # (offsets, targets, weights) as memoryviews, which index as fast as lists in Python loops but
+        # read the arrays in place; not cached, so a memory-mapped graph never gains a private copy.
+        # weights replaces the graph's own weights, e.g. with reweighted ones
+        weights = self.weights if weights is None else weights
+        return memoryview(self.offsets), memoryview(self.targets), memoryview(np.ascontiguousarray(weights))
+
+    def __getstate__(self) -> dict:
+        # Cached views and lookups are rebuilt on demand, so pickles (e.g. for worker processes) leave them out
+        state = self.__dict__.copy()
+        state.update(_cache={}, _node_ids=None, _reverse=None)
+        return state
+
+    def get_sources(self) -> np.ndarray:
+        # Source id of every stored edge, i.e. the COO row array
+        return self._cached("sources", lambda: np.repeat(np.arange(self.order(), dtype=self.targets.dtype),
+                                                         np.diff(self.offsets)))
+
+    def get_adj_array(self, dtype=None, fill_value=0) -> np.ndarray:
+        # Dense V x V matrix in node order; fill_value marks missing edges (e.g. float('inf'))
+        if dtype is None:
+            dtype = np.result_type(self.weights.dtype, np.min_scalar_type(fill_value))
+        n = self.order()
+        adj_array = np.full((n, n), fill_value, dtype=dtype)
+        adj_array[self.get_sources(), self.targets] = self.weights
+        return adj_array
+
+    def get_sparse_adj(self, fmt: str="csr") -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # "csr" returns (offsets, targets, weights); "coo" returns (sources, targets, weights)
+        if fmt == "csr":
+            return self.offsets, self.targets, self.weights
+        if fmt == "coo":
+            return self.get_sources(), self.targets, self.weights
+        raise ValueError(f"Unknown sparse format '{fmt}', expected 'csr' or 'coo'")
+
+    def _build_edge_list(self) -> List[Tuple[str, str, int]]:
+        sources = self.get_sources()
+        targets = self.targets
+        weights = self.weights
+        if not self.directed:
+            # Each undirected edge is stored in both rows; keep one orientation
+            keep = sources < targets
+            sources, targets, weights = sources[keep], targets[keep], weights[keep]
+
+        names = self.node_names
+        return [(names[u], names[v], weight)
+                for u, v, weight in zip(sources.tolist(), targets.tolist(), weights.tolist())]
+
+    def freeze(self) -> "FrozenGraph":
+        return self
+
+    def reverse(self) -> "FrozenGraph":
+        # Transposed CSR (row i holds the predecessors of node i); undirected graphs are their own reverse
+        if not self.directed:
+            return self
+        if self._reverse is None:
+            n = self.order()
+            node_ids = self.node_ids
+            sources = self.get_sources()
+            order = np.lexsort((sources, self.targets))
+            offsets = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.targets, minlength=n), out=offsets[1:])
+
+            sources, weights = sources[order], self.weights[order]
+            for array in (offsets, sources, weights):
+                array.flags.writeable = False
+
+            self._reverse = FrozenGraph(self.title, True, self.weighted, self.node_names, offsets,
+                                        sources, weights, self.negative_weights, self.native_keys)
+            self._reverse._node_ids = node_ids
+            self._reverse._reverse = self
+        return self._reverse
+
+    def thaw(self, track_components: bool=False) -> Graph:
+        graph = Graph(self.title, directed=self.directed, weighted=self.weighted, native_keys=self.native_keys,
+                      track_components=track_components)
+        names = list(self.node_names) if self.native_keys else [str(node) for node in self.node_names]
+        if self.insertion_order is None:
+            graph.add_nodes_from(names)
+        else:
+            graph.add_nodes_from([names[i] for i in self.insertion_order.tolist()])
+
+        # Put every row back in the order its edges were added, with int weights restored
+        targets, weights = self.targets, self.weights
+        if self.row_positions is not None:
+            order = np.lexsort((self.row_positions, self.get_sources()))
+            targets, weights = targets[order], weights[order]
+        weights = weights.tolist()
+        if self.int_weights is not None:
+            restore = self.int_weights if self.row_positions is None else self.int_weights[order]
+            for i in np.flatnonzero(restore).tolist():
+                weights[i] = int(weights[i])
+
+        # Fill whole rows at once instead of calling add_edge per edge
+        offsets, targets = self.offsets.tolist(), targets.tolist()
+        adj_list = graph.adj_list
+        for i, node in enumerate(names):
+            start, end = offsets[i], offsets[i + 1]
+            adj_list[node].update(zip([names[t] for t in targets[start:end]], weights[start:end]))
+        if self.directed:
+            in_adj_list = graph.in_adj_list
+            for source_node, neighbors in adj_list.items():
+                for dest_node, weight in neighbors.items():
+                    in_adj_list[dest_node][source_node] = weight
+
+        graph._edge_count = self.num_edges()
+        graph.negative_weights = self.negative_weights
+        graph._components = None   # Rows were filled directly, so tracked components rebuild on first query
+        graph._touch()
+        return graph
+
+
 class DisjointSet:
-    def __init__(self, graph_order):
-        self.parent = list(range(graph_order))
-        self.rank = [0] * graph_order
+    def __init__(self, graph_order, compact: bool=False):
+        if compact:
+            self.parent = array('q', range(graph_order))
+            self.size = array('q', [1]) * graph_order
+        else:
+            self.parent = list(range(graph_order))
+            self.size = [1] * graph_order
+        self.count = graph_order   # Number of disjoint sets
 
     def find(self, u):
-        if self.parent[u] != u:
-            self.parent[u] = self.find(self.parent[u])
-        return self.parent[u]
+        parent = self.parent
+        while parent[u] != u:
+            parent[u] = parent[parent[u]]   # Path halving
+            u = parent[u]
+        return u
     
-    def union(self, u, v):
+    def union(self, u, v) -> bool:
         root_u = self.find(u)
         root_v = self.find(v)
 
-        if root_u != root_v:
-            if self.rank[root_u] > self.rank[root_v]:
-                self.parent[root_v] = root_u
-            elif self.rank[root_u] < self.rank[root_v]:
-                self.parent[root_u] = root_v
-            else:
-                self.parent[root_v] = root_u
-                self.rank[root_u] += 1
+        if root_u == root_v:
+            return False
+        if self.size[root_u] < self.size[root_v]:
+            root_u, root_v = root_v, root_u
+        self.parent[root_v] = root_u
+        self.size[root_u] += self.size[root_v]
+        self.count -= 1
+        return True
+
+    def connected(self, u, v) -> bool:
+        return self.find(u) == self.find(v)
+
+    def add(self) -> int:
+        # Appends a new singleton set and returns its element
+        self.parent.append(len(self.parent))
+        self.size.append(1)
+        self.count += 1
+        return len(self.parent) - 1
+
+
+class IndexedHeap:
+    def __init__(self, capacity: int):
+        self.heap = []                       # Ids in heap order
+        self.keys = [None] * capacity
+        self.position = [-1] * capacity      # Index of each id in heap, -1 when absent
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __contains__(self, item: int) -> bool:
+        return self.position[item] >= 0
+
+    def push(self, item: int, key) -> bool:
+        # Inserts item, or lowers its key if already queued; returns False if the key was not lower
+        if self.position[item] < 0:
+            self.position[item] = len(self.heap)
+            self.heap.append(item)
+        elif not key < self.keys[item]:
+            return False
+        self.keys[item] = key
+        self._sift_up(self.position[item])
+        return True
+
+    def pop(self) -> Tuple[int, object]:
+        heap = self.heap
+        top = heap[0]
+        last = heap.pop()
+        self.position[top] = -1
+        if heap:
+            heap[0] = last
+            self.position[last] = 0
+            self._sift_down(0)
+        return top, self.keys[top]
+
+    def _sift_up(self, i: int) -> None:
+        heap, keys, position = self.heap, self.keys, self.position
+        item = heap[i]
+        key = keys[item]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if not key < keys[heap[parent]]:
+                break
+            heap[i] = heap[parent]
+            position[heap[i]] = i
+            i = parent
+        heap[i] = item
+        position[item] = i
+
+    def _sift_down(self, i: int) -> None:
+        heap, keys, position = self.heap, self.keys, self.position
+        size = len(heap)
+        item = heap[i]
+        key = keys[item]
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and keys[heap[child + 1]] < keys[heap[child]]:
+                child += 1
+            if not keys[heap[child]] < key:
+                break
+            heap[i] = heap[child]
+            position[heap[i]] = i
+            i = child
+        heap[i] = item
+        position[item] = i
@@ -7,56 +7,46 @@ Contains functions to generate classic graphs such as:
 - Cycle graphs (C_n)
 
 All graph constructors return instances of the Graph class.
+Passing native_keys=True keeps the integer node labels instead of converting them to strings.
 """
 
 
 from graphlib.core import Graph
 
-def k_graph(n: int) -> Graph:
+def k_graph(n: int, native_keys: bool=False) -> Graph:
     if n < 1:
         raise ValueError("A complete graph is not defined for 'n' less than 1")
     
-    k = Graph(f"K_{n}", directed=False, weighted=False)
+    k = Graph(f"K_{n}", directed=False, weighted=False, native_keys=native_keys)
     
-    for i in range(n):
-        k.add_node(i)
+    k.add_nodes_from(range(n))
 
     if n == 1: return k
     
-    for source_node in k.nodes:
-        for dest_node in k.nodes:
-            if not k.has_edge(source_node, dest_node) and source_node != dest_node:
-                k.add_edge(source_node, dest_node)
+    k.add_edges_from((source_node, dest_node) for source_node in range(n) for dest_node in range(source_node + 1, n))
     
     return k
 
-def k_bipartite_graph(n: int, m: int) -> Graph:
+def k_bipartite_graph(n: int, m: int, native_keys: bool=False) -> Graph:
     if n < 0 or m < 0:
         raise ValueError("A complete bipartite graph is not defined for 'n', 'm' less than 0")
 
-    k_bipartite = Graph(f"K_{n},{m}", directed=False, weighted=False)
+    k_bipartite = Graph(f"K_{n},{m}", directed=False, weighted=False, native_keys=native_keys)
 
-    set_U = set()
-    set_V = set()
+    set_U = range(0, n)
+    set_V = range(n, n + m)
 
-    for u_node in range(0, n):
-        k_bipartite.add_node(u_node)
-        set_U.add(u_node)
-    for v_node in range(n, n + m):
-        k_bipartite.add_node(v_node)
-        set_V.add(v_node)
-
-    for u in set_U:
-        for v in set_V:
-            k_bipartite.add_edge(u, v)
+    k_bipartite.add_nodes_from(set_U)
+    k_bipartite.add_nodes_from(set_V)
+    k_bipartite.add_edges_from((u, v) for u in set_U for v in set_V)
     
     return k_bipartite
 
-def c_graph(n: int) -> Graph:
+def c_graph(n: int, native_keys: bool=False) -> Graph:
     if n < 1:
         raise ValueError("A cycle graph is not defined for 'n' less than 1")
     
-    c = Graph(f"C_{n}", directed=False, weighted=False)
+    c = Graph(f"C_{n}", directed=False, weighted=False, native_keys=native_keys)
 
     c.add_node(0)
 
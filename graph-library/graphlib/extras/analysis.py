@@ -4,26 +4,63 @@ analysis.py
 Graph-theoretic tools for analyzing Graph objects.
 
 Includes:
-- Connected component detection
+- Connected component detection (see also Graph.connected / component_count / component_of)
+  - A FrozenGraph is walked over integer ids in its CSR arrays
 - Cycle detection using DFS
 - Eulerian circuit checks and retrieval
+- ReachabilityIndex: answers "can u reach v" in O(1) after one build per graph version
+  - Strongly connected components (iterative Tarjan) are condensed into a DAG numbered in
+    completion order, so every component's DFS subtree is the interval [first, id] of ids
+  - Descendants outside that interval are kept as a trimmed bitset; chains and trees need none,
+    and most negative answers are settled by comparing ids
+  - Rebuilds on the next query after the graph is mutated; stats() reports build time and memory
 """
 
 
 
-from graphlib.core import Graph
+import sys
+import time
+from graphlib.core import Graph, FrozenGraph
 from graphlib.extras import traversals as trv
 from typing import List
 
 def get_components(graph: Graph, sorted: bool=False) -> List[List[str]]:
+    # One pass over the nodes; each traversal starts from a node no earlier component reached
+    if isinstance(graph, FrozenGraph):
+        return _csr_components(graph, sorted)
+    components = []
+    visited_nodes = set()
+
+    for node in graph.nodes:
+        if node in visited_nodes:
+            continue
+        current_component = trv.dfs_order(graph, node)
+        visited_nodes.update(current_component)
+        if sorted: current_component.sort()
+        components.append(current_component)
+
+    if sorted: components.sort(key=len, reverse=True)
+    return components
+
+def _csr_components(graph: FrozenGraph, sorted: bool) -> List[List[str]]:
+    # get_components over integer ids. Undirected traversals share one visited table; a directed
+    # traversal may revisit nodes an earlier one reached, exactly as dfs_order does for a Graph.
+    csr = graph.get_csr_views()
+    names = graph.node_names
+    visited = bytearray(graph.order())
     components = []
-    remaining_nodes = graph.nodes
 
-    while remaining_nodes:
-        current_component = trv.dfs_order(graph, next(iter(remaining_nodes)))
+    for start in range(graph.order()):
+        if visited[start]:
+            continue
+        if graph.directed:
+            component_ids = trv._csr_dfs_order(csr, start, bytearray(graph.order()))
+            for node in component_ids: visited[node] = 1
+        else:
+            component_ids = trv._csr_dfs_order(csr, start, visited)
+        current_component = [names[node] for node in component_ids]
         if sorted: current_component.sort()
         components.append(current_component)
-        remaining_nodes = remaining_nodes - set(current_component)
 
     if sorted: components.sort(key=len, reverse=True)
     return components
@@ -69,3 +106,139 @@ def get_eulerian_circuit(graph: Graph) -> Graph:
     if not is_eulerian(graph):
         return None
     
+
+
+class ReachabilityIndex:
+    # Descendants reached only through cross edges cost one bit each, so memory can still approach
+    # (components)^2 / 8 bytes on dense DAGs; graphs with large strongly connected components,
+    # trees and chains stay small.
+
+    def __init__(self, graph: Graph):
+        self.graph = graph
+        self.version = None
+        self.builds = 0
+        self.build_time = 0.0
+        self.nbytes = 0
+        self._build()
+
+    def reachable(self, u, v) -> bool:
+        if self.version != self.graph.version:
+            self._build()
+        source, target = self._component[self._node_id(u)], self._component[self._node_id(v)]
+        if target > source:
+            return False   # Descendants always have lower component ids
+        if target >= self._first[source]:
+            return True    # Inside the DFS subtree interval
+        position = (target >> 3) - self._base[source]
+        bitset = self._bitsets[source]
+        return 0 <= position < len(bitset) and bool(bitset[position] >> (target & 7) & 1)
+
+    def stats(self) -> dict:
+        return {"nodes": len(self._component), "components": len(self._bitsets), "builds": self.builds,
+                "build_time": self.build_time, "nbytes": self.nbytes}
+
+    def _node_id(self, node) -> int:
+        if not self.graph.native_keys: node = str(node)
+        node_id = self._node_index.get(node)
+        if node_id is None:
+            raise ValueError(f"'{node}' not found in '{self.graph.title}'")
+        return node_id
+
+    def _build(self) -> None:
+        start_time = time.perf_counter()
+        frozen = self.graph.freeze()
+        offsets, targets = frozen.offsets.tolist(), frozen.targets.tolist()
+        component, first = _strong_components(offsets, targets)
+        count = len(first)
+
+        members = [[] for _ in range(count)]
+        for node, c in enumerate(component):
+            members[c].append(node)
+
+        # Tarjan emits every component after all of its descendants, so children are always ready.
+        # Children inside the interval only add their extra bits; others add their whole set.
+        extras = []
+        base = []
+        for c in range(count):
+            children = {component[t] for node in members[c] for t in targets[offsets[node]:offsets[node + 1]]}
+            children.discard(c)
+            bits = 0
+            for child in children:
+                extra = extras[child] << (8 * base[child])
+                if child < first[c]:
+                    extra |= (1 << (child + 1)) - (1 << first[child])
+                bits |= extra
+            bits &= (1 << first[c]) - 1
+            low = ((bits & -bits).bit_length() - 1) >> 3 if bits else 0
+            extras.append(bits >> (8 * low))
+            base.append(low)
+
+        self._bitsets = [bits.to_bytes((bits.bit_length() + 7) >> 3, "little") for bits in extras]
+        self._first = first
+        self._base = base
+        self._component = component
+        self._node_index = frozen.get_node_index()
+        self.version = self.graph.version
+        self.builds += 1
+        self.nbytes = (sum(sys.getsizeof(bitset) for bitset in self._bitsets if bitset) + sys.getsizeof(self._bitsets)
+                       + sys.getsizeof(self._component) + sys.getsizeof(self._first) + sys.getsizeof(self._base))
+        self.build_time = time.perf_counter() - start_time
+
+def _strong_components(offsets: List[int], targets: List[int]):
+    # Iterative Tarjan over a CSR adjacency; returns each node's component id and, per component, the
+    # first id completed inside its DFS subtree. Components are numbered in the order they complete,
+    # which is a reverse topological order.
+    n = len(offsets) - 1
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    component = [-1] * n
+    completed_before = [0] * n   # Components completed when each node was discovered
+    first = []
+    stack = []
+    counter = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        completed_before[root] = len(first)
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, offsets[root])]
+
+        while work:
+            node, position = work[-1]
+            end = offsets[node + 1]
+            while position < end:
+                neighbor = targets[position]
+                position += 1
+                if index[neighbor] == -1:
+                    # Descend; resume this node from the next edge afterwards
+                    work[-1] = (node, position)
+                    index[neighbor] = low[neighbor] = counter
+                    completed_before[neighbor] = len(first)
+                    counter += 1
+                    stack.append(neighbor)
+                    on_stack[neighbor] = True
+                    work.append((neighbor, offsets[neighbor]))
+                    break
+                if on_stack[neighbor] and index[neighbor] < low[node]:
+                    low[node] = index[neighbor]
+            else:
+                work.pop()
+                if low[node] == index[node]:
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component[member] = len(first)
+                        if member == node:
+                            break
+                    first.append(completed_before[node])
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+
+    return component, first
@@ -4,22 +4,36 @@ mst.py
 Implements Minimum Spanning Tree (MST) algorithms for undirected, connected graphs:
 
 - Kruskal's Algorithm: Greedy approach using Disjoint Set (Union-Find) to build MST by edge weight.
-- Prim's Algorithm: Greedy approach expanding MST from an initial node using a priority queue.
+  Connectivity is read off the union count; forest=True returns a minimum spanning forest instead of raising.
+- Prim's Algorithm: Greedy approach expanding MST from an initial node.
+  Sparse graphs use an indexed heap with decrease-key (at most V entries); dense graphs use a
+  vectorized O(V^2) scan of the NumPy adjacency matrix. method="auto" picks by edge density.
+- On a FrozenGraph, Kruskal's sorts the CSR edge arrays with NumPy and Prim's heap runs over
+  integer ids in the CSR arrays; node names are attached only to the tree edges.
+- Boruvka's Algorithm: Each round picks the cheapest outgoing edge of every component, scanning
+  edge-array chunks in worker processes, and merges components through a Disjoint Set.
+  Ties are broken by (weight, edge list index), so the result matches Kruskal's edge for edge.
 
 Raises exceptions for invalid graph types (e.g., directed or disconnected).
 
 Functions:
-- kruskal(graph, verbose=False)
-- prim(graph, verbose=False)
+- kruskal(graph, verbose=False, forest=False)
+- prim(graph, verbose=False, method="auto")
+- boruvka(graph, verbose=False, workers=None, forest=False)
 """
 
 
 
-import heapq
-from graphlib.core import Graph, DisjointSet
-from graphlib.extras import analysis
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from graphlib.core import Graph, FrozenGraph, DisjointSet, IndexedHeap
 
-def kruskal(graph: Graph, verbose: bool=False) -> Graph:
+PRIM_METHODS = ("auto", "heap", "dense")
+DENSE_PRIM_DENSITY = 0.25   # Fraction of possible edges above which method="auto" uses the dense scan
+BORUVKA_CHUNK_SIZE = 1 << 20   # Minimum edges per worker task in boruvka
+
+def kruskal(graph: Graph, verbose: bool=False, forest: bool=False) -> Graph:
 
     # Check for trivial graphs
     if graph.order() <= 1:
@@ -28,66 +42,278 @@ def kruskal(graph: Graph, verbose: bool=False) -> Graph:
     # Check for incompatible graphs
     if graph.directed:
         raise ValueError("Kruskal's Algorithm may only be applied to undirected graphs")
-    if len(analysis.get_components(graph)) != 1:
+    if not forest and graph.num_edges() < graph.order() - 1:
         raise ValueError("Kruskal's Algorithm may only be applied to connected graphs")
     
     # New minimum spanning tree setup
-    mst = Graph(graph.title + "_(mst)", directed=False, weighted=graph.weighted)
-    for node in graph.nodes:
-        mst.add_node(node)
-    if graph.weighted:
-        edge_pool = sorted(graph.get_edge_list(), key=lambda x: x[2])
+    mst = Graph(graph.title + "_(mst)", directed=False, weighted=graph.weighted, native_keys=graph.native_keys)
+    mst.add_nodes_from(graph.nodes)
+    ds = DisjointSet(graph.order())
+    tree_edges = []
+
+    if isinstance(graph, FrozenGraph):
+        # Each undirected edge once (u < v), sorted by weight in one NumPy pass; names only for tree edges
+        names = graph.node_names
+        rows = np.repeat(np.arange(graph.order()), np.diff(graph.offsets))
+        keep = rows < graph.targets
+        us, vs, weights = rows[keep], graph.targets[keep], graph.weights[keep]
+        if graph.weighted:
+            ranked = np.argsort(weights, kind="stable")
+            us, vs, weights = us[ranked], vs[ranked], weights[ranked]
+        for u, v, weight in zip(us.tolist(), vs.tolist(), weights.tolist()):
+            if ds.union(u, v):
+                tree_edges.append((names[u], names[v], weight))
+                if verbose: print(f"Adding edge: ({names[u]}, {names[v]}, {weight})")
+                if ds.count == 1:
+                    break   # Spanning tree complete
     else:
-        edge_pool = graph.get_edge_list()
+        if graph.weighted:
+            edge_pool = sorted(graph.get_edge_list(), key=lambda x: x[2])
+        else:
+            edge_pool = graph.get_edge_list()
 
-    # Kruskal's Algorithm using DisjointSet structure
-    node_to_index = {node: i for i, node in enumerate(graph.nodes)}
-    ds = DisjointSet(graph.order())
-    for u, v, weight in edge_pool:
-        if ds.find(node_to_index[u]) != ds.find(node_to_index[v]):
-            ds.union(node_to_index[u], node_to_index[v])
-            mst.add_edge(u, v, weight)
-            if verbose: print(f"Adding edge: ({u}, {v}, {weight})")
+        # Kruskal's Algorithm using DisjointSet structure
+        node_to_index = graph.get_node_index()
+        for u, v, weight in edge_pool:
+            if ds.union(node_to_index[u], node_to_index[v]):
+                tree_edges.append((u, v, weight))
+                if verbose: print(f"Adding edge: ({u}, {v}, {weight})")
+                if ds.count == 1:
+                    break   # Spanning tree complete
+
+    # Each component left over means the graph is disconnected
+    if ds.count != 1 and not forest:
+        raise ValueError("Kruskal's Algorithm may only be applied to connected graphs")
 
+    mst.add_edges_from(tree_edges)
     return mst
 
-def prim(graph: Graph, verbose: bool=False) -> Graph:
+def prim(graph: Graph, verbose: bool=False, method: str="auto") -> Graph:
 
     # Check for trivial graphs
     if graph.order() <= 1:
         return graph
 
     # Check for incompatible graphs
+    if method not in PRIM_METHODS:
+        raise ValueError(f"Unknown Prim method '{method}', expected one of {PRIM_METHODS}")
     if graph.directed:
         raise ValueError("Prim's Algorithm may only be applied to undirected graphs")
-    if len(analysis.get_components(graph)) != 1:
+    n = graph.order()
+    if graph.num_edges() < n - 1:
         raise ValueError("Prim's Algorithm may only be applied to connected graphs")
-    
+
+    if method == "auto":
+        method = "dense" if graph.num_edges() >= DENSE_PRIM_DENSITY * n * (n - 1) / 2 else "heap"
+    if method == "dense":
+        parent = _prim_dense(graph)
+    else:
+        parent = _prim_heap(graph)
+
+    # A node never reached means the graph is disconnected
+    if len(parent) != n - 1:
+        raise ValueError("Prim's Algorithm may only be applied to connected graphs")
+
     # New minimum spanning tree setup
-    mst = Graph(graph.title + "_(mst)", directed=False, weighted=graph.weighted)
-    for node in graph.nodes:
-        mst.add_node(node)
-    
-    # Prim's Algorithm
-    nodes_list = list(graph.nodes)
-    start_node = nodes_list[0]
-    edge_pool = []
-    visited_nodes = {start_node}
-
-    for neighbor, weight in graph.adj_list[start_node].items():
-        heapq.heappush(edge_pool, (weight, start_node, neighbor))
-    
-    while edge_pool:
-        weight, source_node, dest_node = heapq.heappop(edge_pool)
+    mst = Graph(graph.title + "_(mst)", directed=False, weighted=graph.weighted, native_keys=graph.native_keys)
+    mst.add_nodes_from(graph.nodes)
+    nodes = graph.get_node_order()
+    tree_edges = []
+    for v, u, weight in parent:
+        source_node, dest_node = nodes[u], nodes[v]
+        tree_edges.append((source_node, dest_node, weight))
+        if verbose: print(f"Adding edge: ({source_node}, {dest_node}, {weight})")
+    mst.add_edges_from(tree_edges)
+
+    return mst
 
-        if dest_node not in visited_nodes:
-            mst.add_edge(source_node, dest_node, weight)
-            if verbose: print(f"Adding edge: ({source_node}, {dest_node}, {weight})")
-            visited_nodes.add(dest_node)
+def _prim_heap(graph: Graph) -> list:
+    # Returns (node, parent, weight) triples, by index, in the order nodes join the tree
+    nodes = graph.get_node_order()
+    node_index = graph.get_node_index()
+    adj_list = graph.adj_list
+    n = len(nodes)
+
+    in_tree = [False] * n
+    via = [-1] * n
+    heap = IndexedHeap(n)
+    heap.push(0, 0)
+    parent = []
+
+    if isinstance(graph, FrozenGraph):
+        # Node order is the CSR id order, so rows are read straight from the CSR arrays
+        offsets, targets, weights = graph.get_csr_views()
+        while heap:
+            u, key = heap.pop()
+            in_tree[u] = True
+            if u:
+                parent.append((u, via[u], key))
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                if not in_tree[v] and heap.push(v, weights[i]):
+                    via[v] = u
+        return parent
+
+    while heap:
+        u, key = heap.pop()
+        in_tree[u] = True
+        if u:
+            parent.append((u, via[u], key))
+        for neighbor, weight in adj_list[nodes[u]].items():
+            v = node_index[neighbor]
+            if not in_tree[v] and heap.push(v, weight):
+                via[v] = u
+
+    return parent
+
+def _prim_dense(graph: Graph) -> list:
+    # O(V^2) Prim over the adjacency matrix: each step is one vectorized argmin and one row update
+    n = graph.order()
+    if isinstance(graph, FrozenGraph):
+        adj_array = graph.get_adj_array(dtype=np.float64, fill_value=np.inf)
+    else:
+        # Filling row by row skips the sort that building the CSR form would need
+        node_index = graph.get_node_index()
+        adj_array = np.full((n, n), np.inf)
+        for i, node in enumerate(graph.get_node_order()):
+            row = graph.adj_list[node]
+            adj_array[i, list(map(node_index.__getitem__, row))] = list(row.values())
+
+    best = adj_array[0].copy()          # Cheapest known edge from the tree to each node
+    via = np.zeros(n, dtype=np.int64)
+    in_tree = np.zeros(n, dtype=bool)
+    in_tree[0] = True
+    best[0] = np.inf
+    parent = []
+
+    for _ in range(n - 1):
+        v = int(np.argmin(best))
+        if best[v] == np.inf:
+            break   # Remaining nodes are unreachable
+        parent.append((v, int(via[v])))
+        in_tree[v] = True
+        best[v] = np.inf
+        closer = (adj_array[v] < best) & ~in_tree
+        best[closer] = adj_array[v][closer]
+        via[closer] = v
+
+    # The matrix holds float copies, so report the weights as the graph stores them
+    nodes = graph.get_node_order()
+    return [(v, u, graph.adj_list[nodes[u]][nodes[v]]) for v, u in parent]
+
+def boruvka(graph: Graph, verbose: bool=False, workers: int=None, forest: bool=False) -> Graph:
+    # workers=None uses every core, workers=1 runs in this process.
+
+    # Check for trivial graphs
+    if graph.order() <= 1:
+        return graph
+
+    # Check for incompatible graphs
+    if graph.directed:
+        raise ValueError("Boruvka's Algorithm may only be applied to undirected graphs")
+    n = graph.order()
+    if not forest and graph.num_edges() < n - 1:
+        raise ValueError("Boruvka's Algorithm may only be applied to connected graphs")
+
+    # Edges sorted by (weight, edge list index), so an edge's rank is its tie-broken key
+    nodes, sources, targets, weights = _edge_arrays(graph)
+    order = np.argsort(weights, kind="stable") if graph.weighted else np.arange(len(sources))
+    sources, targets = sources[order], targets[order]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if len(sources) < 2 * BORUVKA_CHUNK_SIZE:
+        workers = 1
+
+    ds = DisjointSet(n)
+    labels = np.arange(n)
+    tree_ranks = []
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(sources, targets))
+    try:
+        live = np.arange(len(sources))   # Edges that may still join two components
+        while ds.count > 1:
+            if executor is None:
+                # Drop edges that now lie inside a component so later rounds scan less
+                live = live[labels[sources[live]] != labels[targets[live]]]
+                cheapest = _cheapest_edges(labels, sources[live], targets[live], live)
+            else:
+                # Workers hold the full edge arrays; each round only the labels are shipped
+                chunk = max(BORUVKA_CHUNK_SIZE, -(-len(sources) // workers))
+                starts = range(0, len(sources), chunk)
+                cheapest = np.minimum.reduce(list(executor.map(_worker_cheapest_edges, [labels] * len(starts),
+                                                               starts, [chunk] * len(starts))))
+
+            chosen = np.unique(cheapest[cheapest < len(sources)])
+            if not len(chosen):
+                break   # Remaining components have no edges between them
+            for rank in chosen.tolist():
+                if ds.union(int(sources[rank]), int(targets[rank])):
+                    tree_ranks.append(rank)
+
+            # Point every node straight at its root
+            parent = np.array(ds.parent)
+            while True:
+                grandparent = parent[parent]
+                if np.array_equal(grandparent, parent):
+                    break
+                parent = grandparent
+            labels = parent
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    # Each component left over means the graph is disconnected
+    if ds.count != 1 and not forest:
+        raise ValueError("Boruvka's Algorithm may only be applied to connected graphs")
+
+    # New minimum spanning tree setup, edges in the order Kruskal's would add them
+    mst = Graph(graph.title + "_(mst)", directed=False, weighted=graph.weighted, native_keys=graph.native_keys)
+    mst.add_nodes_from(graph.nodes)
+    tree_ranks.sort()
+    frozen = isinstance(graph, FrozenGraph)
+    tree_weights = weights[order[tree_ranks]].tolist() if frozen else None
+    tree_edges = []
+    for i, rank in enumerate(tree_ranks):
+        source_node, dest_node = nodes[sources[rank]], nodes[targets[rank]]
+        weight = tree_weights[i] if frozen else graph.adj_list[source_node][dest_node]
+        tree_edges.append((source_node, dest_node, weight))
+        if verbose: print(f"Adding edge: ({source_node}, {dest_node}, {weight})")
+    mst.add_edges_from(tree_edges)
 
-            for neighbor, weight in graph.adj_list[dest_node].items():
-                if neighbor not in visited_nodes:
-                    heapq.heappush(edge_pool, (weight, dest_node, neighbor))
-    
     return mst
-        
\ No newline at end of file
+
+def _edge_arrays(graph: Graph) -> tuple:
+    # Node order plus source, target and weight arrays, one entry per get_edge_list() edge
+    if isinstance(graph, FrozenGraph):
+        sources, targets, weights = graph.get_sources(), graph.targets, graph.weights
+        keep = sources < targets
+        return graph.get_node_order(), sources[keep], targets[keep], weights[keep]
+
+    node_index = graph.get_node_index()
+    edge_list = graph.get_edge_list()
+    sources = np.fromiter((node_index[edge[0]] for edge in edge_list), dtype=np.int64, count=len(edge_list))
+    targets = np.fromiter((node_index[edge[1]] for edge in edge_list), dtype=np.int64, count=len(edge_list))
+    return graph.get_node_order(), sources, targets, np.array([edge[2] for edge in edge_list])
+
+def _cheapest_edges(labels: np.ndarray, sources: np.ndarray, targets: np.ndarray, ranks: np.ndarray) -> np.ndarray:
+    # Lowest rank of an edge leaving each component over this chunk; int64 max where there is none
+    source_labels, target_labels = labels[sources], labels[targets]
+    cross = source_labels != target_labels
+    ranks = ranks[cross]
+    cheapest = np.full(len(labels), np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(cheapest, source_labels[cross], ranks)
+    np.minimum.at(cheapest, target_labels[cross], ranks)
+    return cheapest
+
+_worker_edges = None
+
+def _init_worker(sources, targets) -> None:
+    global _worker_edges
+    _worker_edges = (sources, targets)
+
+def _worker_cheapest_edges(labels: np.ndarray, start: int, size: int) -> np.ndarray:
+    sources, targets = _worker_edges
+    stop = min(start + size, len(sources))
+    return _cheapest_edges(labels, sources[start:stop], targets[start:stop], np.arange(start, stop))
@@ -4,30 +4,175 @@ pathfinding.py
 Implements classical shortest path algorithms:
 
 - Dijkstra's Algorithm: Computes shortest paths from a source in graphs with non-negative weights.
+  Picks an engine from the weights: BFS when every edge weighs the same, a bucket queue (Dial's algorithm)
+  for small integer weights, otherwise a binary heap. On a FrozenGraph every engine (and the
+  point-to-point search) runs over integer ids in the CSR arrays.
+- Batched Dijkstra: Runs many sources in parallel worker processes that receive the graph once.
+  A graph opened with utils.load_mapped is re-mapped from its file by each worker, so they all share
+  the page cache; any other graph (and Johnson's reweighted weights) is pickled to every worker.
+- Point-to-point Dijkstra: Stops once the target is settled; optionally searches from both ends at once.
+- A* Search: Point-to-point search guided by a heuristic, e.g. Euclidean or Manhattan distance between node coordinates.
 - Bellman-Ford Algorithm: Handles graphs with negative weights, detects negative cycles.
-- Floyd-Warshall Algorithm: All-pairs shortest paths via dynamic programming.
+  Stops after the first pass with no changes; spfa=True only re-examines nodes whose distance changed.
+- Floyd-Warshall Algorithm: All-pairs shortest paths via dynamic programming, vectorized with NumPy.
+  floyd_warshall_matrix also returns a predecessor matrix and the node order of the rows/columns.
+- Johnson's Algorithm: All-pairs shortest paths for sparse graphs; one Bellman-Ford reweighting, then a
+  Dijkstra per source spread over worker processes, streaming one distance row per source.
 
-Returns shortest path trees and/or distance matrices. Raises errors for invalid inputs or negative cycles.
+Returns shortest path trees and/or distance matrices. Raises errors for invalid inputs or negative cycles;
+NegativeCycleError (a ValueError) carries the offending cycle.
+
+dijkstra and bellman_ford accept an optional PathCache, a bounded LRU cache of per-source results that is
+dropped whenever the graph's mutation version changes.
 
 Functions:
-- dijkstra(graph, source_node)
-- bellman_ford(graph, source_node)
+- dijkstra(graph, source_node, cache=None, engine="auto")
+- dijkstra_many(graph, sources, workers=None, stream=False)
+- shortest_path(graph, source_node, target_node, bidirectional=False)
+- astar(graph, source_node, target_node, heuristic=None, coordinates=None)
+- bellman_ford(graph, source_node, spfa=False, cache=None)
 - floyd_warshall(graph)
+- floyd_warshall_matrix(graph)
+- reconstruct_path(predecessors, nodes, source_index, target_index)
+- johnson(graph, sources=None, workers=None)
 """
 
 
 
 import heapq
-from typing import Tuple, List
-from graphlib.core import Graph
+import math
+import os
+import weakref
+import numpy as np
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+from typing import Iterator, Tuple, List
+from graphlib.core import Graph, FrozenGraph
+from graphlib.utils import load_mapped
+
+class NegativeCycleError(ValueError):
+    def __init__(self, cycle: List[str]):
+        self.cycle = cycle   # Closed walk in edge order, first node == last node
+        super().__init__("Negative cycle detected: " + " -> ".join(str(node) for node in cycle))
+
+class PathCache:
+    # Bounded LRU cache of (shortest path tree, distances) per algorithm and source for one graph at a time.
+    # Entries are dropped as soon as the graph's version changes (any add/remove of nodes or edges).
+    # Cached results are shared between callers, so treat them as read-only.
+
+    def __init__(self, maxsize: int=128):
+        if maxsize < 1:
+            raise ValueError("PathCache needs room for at least one entry")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._graph = None
+        self._version = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, graph: Graph, key):
+        self._sync(graph)
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def store(self, graph: Graph, key, result) -> None:
+        self._sync(graph)
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
 
-def dijkstra(graph: Graph, source_node: str) -> Tuple[Graph, dict]:
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "invalidations": self.invalidations, "size": len(self._entries), "maxsize": self.maxsize}
+
+    def _sync(self, graph: Graph) -> None:
+        # Bind to the graph being queried and forget everything computed for another graph or version
+        if self._graph is None or self._graph() is not graph or self._version != graph.version:
+            if self._entries:
+                self.invalidations += 1
+                self._entries.clear()
+            self._graph = weakref.ref(graph)
+            self._version = graph.version
+
+DIJKSTRA_ENGINES = ("auto", "heap", "bfs", "dial")
+DIAL_MAX_WEIGHT = 100   # Largest integer weight for which "auto" picks the bucket queue
+
+# Distance functions over coordinate differences; the last axis holds the dimensions
+HEURISTICS = {
+    "euclidean": lambda delta: np.sqrt(np.sum(np.square(delta), axis=-1)),
+    "manhattan": lambda delta: np.sum(np.abs(delta), axis=-1),
+}
+
+def dijkstra(graph: Graph, source_node: str, cache: PathCache=None, engine: str="auto") -> Tuple[Graph, dict]:
     if graph.negative_weights > 0:
         raise ValueError("Dijkstra's Algorithm may only be applied to non-negative edge weights")
+    if engine not in DIJKSTRA_ENGINES:
+        raise ValueError(f"Unknown engine '{engine}', expected one of {list(DIJKSTRA_ENGINES)}")
 
-    if not graph.has_node(source_node):
-        raise ValueError(f"'{source_node}' not found in '{graph.title}'")
-    
+    source_node = graph.resolve_node(source_node)
+    # The engine is settled (and checked against the weights) before the cache is consulted; engines can
+    # break ties into different trees, so each one caches its own results
+    engine = _dijkstra_engine(graph, engine)
+    return _with_cache(cache, graph, ("dijkstra", source_node, engine),
+                       lambda: _dijkstra(graph, source_node, engine))
+
+def _with_cache(cache: PathCache, graph: Graph, key, compute):
+    if cache is None:
+        return compute()
+    result = cache.lookup(graph, key)
+    if result is None:
+        result = compute()
+        cache.store(graph, key, result)
+    return result
+
+def _dijkstra_engine(graph: Graph, engine: str) -> str:
+    # Resolves "auto" from the weight range and rejects an engine the weights do not allow
+    min_weight, max_weight, integral = graph.get_weight_range()
+    if engine == "auto":
+        if min_weight == max_weight:
+            return "bfs"   # Includes every unweighted graph
+        if integral and max_weight <= DIAL_MAX_WEIGHT:
+            return "dial"
+        return "heap"
+
+    if engine == "bfs" and min_weight != max_weight:
+        raise ValueError("The BFS engine needs every edge to have the same weight")
+    if engine == "dial" and not integral:
+        raise ValueError("The bucket queue engine needs integer weights")
+    return engine
+
+def _dijkstra(graph: Graph, source_node: str, engine: str) -> Tuple[Graph, dict]:
+    _, max_weight, _ = graph.get_weight_range()
+    if isinstance(graph, FrozenGraph):
+        return _csr_dijkstra(graph, graph.node_ids[source_node], engine, max_weight)
+
+    if engine == "bfs":
+        distances, parent = _bfs_distances(graph, source_node, max_weight)
+    elif engine == "dial":
+        distances, parent = _dial_distances(graph, source_node, max_weight)
+    else:
+        distances, parent = _heap_distances(graph, source_node)
+
+    tree_edges = [(neighbor, node, graph.adj_list[neighbor][node]) for node, neighbor in parent.items()]
+    return _shortest_path_tree(graph, tree_edges, "dijkstra_spt"), distances
+
+def _heap_distances(graph: Graph, source_node: str) -> Tuple[dict, dict]:
     # Dijkstra's Algorithm
     distances = {node: float('inf') for node in graph.nodes}
     distances[source_node] = 0
@@ -36,48 +181,374 @@ def dijkstra(graph: Graph, source_node: str) -> Tuple[Graph, dict]:
 
     while min_heap:
         distance, current_node = heapq.heappop(min_heap)
+        if distance > distances[current_node]:
+            continue   # Stale entry; a shorter distance was already settled
 
-        for neighbor in graph.adj_list[current_node]:
-            tenative_distance = distances[current_node] + graph.adj_list[current_node][neighbor]
+        for neighbor, weight in graph.adj_list[current_node].items():
+            tenative_distance = distance + weight
             if tenative_distance < distances[neighbor]:
                 distances[neighbor] = tenative_distance
                 parent[neighbor] = current_node
                 heapq.heappush(min_heap, (tenative_distance, neighbor))
-    
-    # Construct shortest path tree (spt)
-    spt = Graph(f"{graph.title}_(dijkstra_spt)", directed=graph.directed, weighted=graph.weighted)
-    for node, neighbor in parent.items():
-        spt.add_node(node)
-        spt.add_node(neighbor)
-        spt.add_edge(neighbor, node, graph.adj_list[neighbor][node])
 
-    return spt, distances
+    return distances, parent
+
+def _bfs_distances(graph: Graph, source_node: str, weight: int) -> Tuple[dict, dict]:
+    # Every edge weighs the same, so nodes are settled in plain BFS order
+    distances = {node: float('inf') for node in graph.nodes}
+    distances[source_node] = 0
+    queue = deque([source_node])
+    parent = {}
+
+    while queue:
+        current_node = queue.popleft()
+        distance = distances[current_node] + weight
+        for neighbor in graph.adj_list[current_node]:
+            if distances[neighbor] == float('inf'):
+                distances[neighbor] = distance
+                parent[neighbor] = current_node
+                queue.append(neighbor)
+
+    return distances, parent
+
+def _dial_distances(graph: Graph, source_node: str, max_weight: int) -> Tuple[dict, dict]:
+    # Bucket queue: max_weight + 1 circular buckets cover every distance that can be pending at once
+    distances = {node: float('inf') for node in graph.nodes}
+    distances[source_node] = 0
+    buckets = [[] for _ in range(max_weight + 1)]
+    buckets[0].append(source_node)
+    pending = 1
+    current = 0
+    parent = {}
+
+    while pending:
+        bucket = buckets[current % len(buckets)]
+        while bucket:
+            current_node = bucket.pop()
+            pending -= 1
+            if distances[current_node] != current:
+                continue   # Stale entry
+            for neighbor, weight in graph.adj_list[current_node].items():
+                tenative_distance = current + weight
+                if tenative_distance < distances[neighbor]:
+                    distances[neighbor] = tenative_distance
+                    parent[neighbor] = current_node
+                    buckets[tenative_distance % len(buckets)].append(neighbor)
+                    pending += 1
+        current += 1
+
+    return distances, parent
+
+def _shortest_path_tree(graph: Graph, tree_edges: list, suffix: str) -> Graph:
+    spt = Graph(f"{graph.title}_({suffix})", directed=graph.directed, weighted=graph.weighted,
+                native_keys=graph.native_keys)
+    spt.add_edges_from(tree_edges)
+    return spt
+
+def _csr_dijkstra(graph: FrozenGraph, source_id: int, engine: str, max_weight) -> Tuple[Graph, dict]:
+    # The engines above over integer ids; names are attached only to the results
+    offsets, targets, weights = graph.get_csr_views()
+    n = len(offsets) - 1
+    inf = float('inf')
+    distances = [inf] * n
+    distances[source_id] = 0
+    parent = [-1] * n
+    parent_weight = [0] * n
+
+    if engine == "bfs":
+        order = [source_id]
+        for u in order:
+            distance = distances[u] + max_weight
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                if distances[v] == inf:
+                    distances[v] = distance
+                    parent[v], parent_weight[v] = u, weights[i]
+                    order.append(v)
+    elif engine == "dial":
+        buckets = [[] for _ in range(max_weight + 1)]
+        buckets[0].append(source_id)
+        pending = 1
+        current = 0
+        while pending:
+            bucket = buckets[current % len(buckets)]
+            while bucket:
+                u = bucket.pop()
+                pending -= 1
+                if distances[u] != current:
+                    continue
+                for i in range(offsets[u], offsets[u + 1]):
+                    v = targets[i]
+                    tenative_distance = current + weights[i]
+                    if tenative_distance < distances[v]:
+                        distances[v] = tenative_distance
+                        parent[v], parent_weight[v] = u, weights[i]
+                        buckets[tenative_distance % len(buckets)].append(v)
+                        pending += 1
+            current += 1
+    else:
+        min_heap = [(0, source_id)]
+        while min_heap:
+            distance, u = heapq.heappop(min_heap)
+            if distance > distances[u]:
+                continue
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                tenative_distance = distance + weights[i]
+                if tenative_distance < distances[v]:
+                    distances[v] = tenative_distance
+                    parent[v], parent_weight[v] = u, weights[i]
+                    heapq.heappush(min_heap, (tenative_distance, v))
+
+    names = graph.node_names
+    tree_edges = [(names[u], names[v], parent_weight[v]) for v, u in enumerate(parent) if u >= 0]
+    return _shortest_path_tree(graph, tree_edges, "dijkstra_spt"), dict(zip(names, distances))
+
+def dijkstra_many(graph: Graph, sources, workers: int=None, stream: bool=False):
+    # Distances from every source as float64 arrays in sorted node order (inf when unreachable).
+    # Returns {source: distances}, or with stream=True a generator of (source, distances) pairs.
+    # workers=None uses every core, workers=1 runs in this process.
+    if graph.negative_weights > 0:
+        raise ValueError("Dijkstra's Algorithm may only be applied to non-negative edge weights")
+
+    frozen = graph.freeze()
+    source_ids = [frozen.node_ids[graph.resolve_node(node)] for node in sources]
+    rows = ((frozen.node_names[source_id], distances)
+            for source_id, distances in _distance_rows(frozen, None, None, source_ids, workers))
+    return rows if stream else dict(rows)
+
+def shortest_path(graph: Graph, source_node: str, target_node: str,
+                  bidirectional: bool=False) -> Tuple[List[str], float]:
+    if graph.negative_weights > 0:
+        raise ValueError("Dijkstra's Algorithm may only be applied to non-negative edge weights")
+
+    source_node = graph.resolve_node(source_node)
+    target_node = graph.resolve_node(target_node)
+    if source_node == target_node:
+        return [source_node], 0
+
+    if bidirectional:
+        return _bidirectional_dijkstra(graph, source_node, target_node)
+    path, distance, _ = _point_to_point(graph, source_node, target_node)
+    return path, distance
+
+def astar(graph: Graph, source_node: str, target_node: str, heuristic=None,
+          coordinates=None) -> Tuple[List[str], float, int]:
+    # heuristic is a callable h(node, target), "euclidean"/"manhattan" over coordinates, or None
+    # (Euclidean when coordinates are given, otherwise zero, which is plain Dijkstra).
+    # coordinates maps node -> (x, y, ...) or is a NumPy array with one row per node in sorted node order.
+    # Returns the path, its distance and the number of nodes expanded.
+    if graph.negative_weights > 0:
+        raise ValueError("A* Search may only be applied to non-negative edge weights")
+
+    source_node = graph.resolve_node(source_node)
+    target_node = graph.resolve_node(target_node)
 
-def bellman_ford(graph: Graph, source_node: str) -> Tuple[Graph, dict]:
-    if not graph.has_node(source_node):
-        raise ValueError(f"'{source_node}' not found in '{graph.title}'")
+    if callable(heuristic):
+        estimate = lambda node: heuristic(node, target_node)
+    elif heuristic is None and coordinates is None:
+        estimate = None
+    else:
+        metric = heuristic or "euclidean"
+        if metric not in HEURISTICS:
+            raise ValueError(f"Unknown heuristic '{metric}', expected one of {list(HEURISTICS)} or a callable")
+        estimate = _coordinate_heuristic(graph, coordinates, target_node, HEURISTICS[metric])
+
+    return _point_to_point(graph, source_node, target_node, estimate)
+
+def _coordinate_heuristic(graph: Graph, coordinates, target_node: str, metric):
+    if coordinates is None:
+        raise ValueError("Coordinate heuristics need a coordinates table")
+    if isinstance(coordinates, np.ndarray):
+        # Distance from every node to the target in one vectorized pass
+        node_index = graph.get_node_index()
+        estimates = metric(coordinates - coordinates[node_index[target_node]]).tolist()
+        return lambda node: estimates[node_index[node]]
+
+    # Per-node lookups; plain Python math is faster than NumPy on single points
+    target = list(coordinates[target_node])
+    if metric is HEURISTICS["euclidean"]:
+        return lambda node: math.dist(coordinates[node], target)
+    if metric is HEURISTICS["manhattan"]:
+        return lambda node: sum(abs(a - b) for a, b in zip(coordinates[node], target))
+    return lambda node: float(metric(np.subtract(coordinates[node], target)))
+
+def _trace_path(parent: dict, node: str) -> List[str]:
+    path = [node]
+    while node in parent:
+        node = parent[node]
+        path.append(node)
+    return path
+
+def _point_to_point(graph: Graph, source_node: str, target_node: str,
+                    estimate=None) -> Tuple[List[str], float, int]:
+    # Dijkstra, or A* when estimate(node) gives a lower bound on the remaining distance;
+    # heap entries are (estimated total, -distance so far, push counter, node): ties on the estimate
+    # go to the node furthest along, and the counter keeps node keys from ever being compared
+    if isinstance(graph, FrozenGraph):
+        return _csr_point_to_point(graph, source_node, target_node, estimate)
+    distances = {source_node: 0}
+    parent = {}
+    pushes = count(1)
+    min_heap = [(estimate(source_node) if estimate else 0, 0, 0, source_node)]
+    expanded = 0
+
+    while min_heap:
+        _, distance, _, current_node = heapq.heappop(min_heap)
+        distance = -distance
+        if distance > distances[current_node]:
+            continue   # Stale entry
+        expanded += 1
+        if current_node == target_node:
+            return _trace_path(parent, target_node)[::-1], distance, expanded
+
+        for neighbor, weight in graph.adj_list[current_node].items():
+            tenative_distance = distance + weight
+            if tenative_distance < distances.get(neighbor, float('inf')):
+                distances[neighbor] = tenative_distance
+                parent[neighbor] = current_node
+                priority = tenative_distance + estimate(neighbor) if estimate else tenative_distance
+                heapq.heappush(min_heap, (priority, -tenative_distance, next(pushes), neighbor))
+
+    return [], float('inf'), expanded
+
+def _csr_point_to_point(graph: FrozenGraph, source_node: str, target_node: str,
+                        estimate=None) -> Tuple[List[str], float, int]:
+    # _point_to_point over integer ids; estimate is still called with node names
+    offsets, targets, weights = graph.get_csr_views()
+    names = graph.node_names
+    source_id, target_id = graph.node_ids[source_node], graph.node_ids[target_node]
+    inf = float('inf')
+    distances = [inf] * len(names)
+    distances[source_id] = 0
+    parent = [-1] * len(names)
+    pushes = count(1)
+    min_heap = [(estimate(source_node) if estimate else 0, 0, 0, source_id)]
+    expanded = 0
+
+    while min_heap:
+        _, distance, _, u = heapq.heappop(min_heap)
+        distance = -distance
+        if distance > distances[u]:
+            continue   # Stale entry
+        expanded += 1
+        if u == target_id:
+            path = [target_id]
+            while path[-1] != source_id:
+                path.append(parent[path[-1]])
+            return [names[node] for node in reversed(path)], distance, expanded
+
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            tenative_distance = distance + weights[i]
+            if tenative_distance < distances[v]:
+                distances[v] = tenative_distance
+                parent[v] = u
+                priority = tenative_distance + estimate(names[v]) if estimate else tenative_distance
+                heapq.heappush(min_heap, (priority, -tenative_distance, next(pushes), v))
+
+    return [], inf, expanded
+
+def _bidirectional_dijkstra(graph: Graph, source_node: str, target_node: str) -> Tuple[List[str], float]:
+    # Side 0 searches forward from the source, side 1 backward from the target over incoming edges
+    adjacency = (graph.adj_list, graph.in_adj_list)
+    distances = ({source_node: 0}, {target_node: 0})
+    parents = ({}, {})
+    heaps = ([(0, source_node)], [(0, target_node)])
+    best_distance = float('inf')
+    meeting_node = None
+
+    while heaps[0] and heaps[1]:
+        # No path through unsettled nodes can beat the best meeting found so far
+        if heaps[0][0][0] + heaps[1][0][0] >= best_distance:
+            break
+
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        distance, current_node = heapq.heappop(heaps[side])
+        if distance > distances[side][current_node]:
+            continue   # Stale entry
+
+        own, other = distances[side], distances[1 - side]
+        for neighbor, weight in adjacency[side][current_node].items():
+            tenative_distance = distance + weight
+            if tenative_distance < own.get(neighbor, float('inf')):
+                own[neighbor] = tenative_distance
+                parents[side][neighbor] = current_node
+                heapq.heappush(heaps[side], (tenative_distance, neighbor))
+            if neighbor in other and own[neighbor] + other[neighbor] < best_distance:
+                best_distance = own[neighbor] + other[neighbor]
+                meeting_node = neighbor
+
+    if meeting_node is None:
+        return [], float('inf')
+    path = _trace_path(parents[0], meeting_node)[::-1] + _trace_path(parents[1], meeting_node)[1:]
+    return path, best_distance
+
+def bellman_ford(graph: Graph, source_node: str, spfa: bool=False, cache: PathCache=None) -> Tuple[Graph, dict]:
+    source_node = graph.resolve_node(source_node)
+    return _with_cache(cache, graph, ("bellman_ford", source_node), lambda: _bellman_ford(graph, source_node, spfa))
+
+def _bellman_ford(graph: Graph, source_node: str, spfa: bool) -> Tuple[Graph, dict]:
+    # Single snapshot of every directed arc (undirected edges appear in both directions)
+    adjacency = {node: list(neighbors.items()) for node, neighbors in graph.adj_list.items()}
 
     # Bellman–Ford Algorithm
     distances = {node: float('inf') for node in graph.nodes}
     distances[source_node] = 0
     parent = {}
+
+    if spfa:
+        _spfa(adjacency, source_node, distances, parent)
+    else:
+        edges = [(u, v, weight) for u, neighbors in adjacency.items() for v, weight in neighbors]
+        for i in range(graph.order()):
+            last_relaxed = None
+            for u, v, weight in edges:
+                if distances[u] + weight < distances[v]:
+                    distances[v] = distances[u] + weight
+                    parent[v] = u
+                    last_relaxed = v
+            if last_relaxed is None:
+                break   # Distances have settled
+            if i == graph.order() - 1:  # Still relaxing on the V-th iteration
+                raise NegativeCycleError(_negative_cycle(parent, last_relaxed, graph.order()))
     
-    for i in range(graph.order()):
-        for u, v, weight in graph.get_edge_list():
-            if distances[u] != float('inf') and distances[u] + weight < distances[v]:
-                if i == graph.order() - 1:  # On the V-th iteration
-                    raise ValueError("Negative cycle detected")
+    # Construct shortest path tree (SPT)
+    tree_edges = [(neighbor, node, graph.adj_list[neighbor][node]) for node, neighbor in parent.items()]
+    return _shortest_path_tree(graph, tree_edges, "bf_spt"), distances
+
+def _spfa(adjacency: dict, source_node: str, distances: dict, parent: dict) -> None:
+    # Queue-based Bellman-Ford; a shortest path never needs V or more edges
+    n = len(adjacency)
+    path_edges = {source_node: 0}
+    queue = deque([source_node])
+    queued = {source_node}
+
+    while queue:
+        u = queue.popleft()
+        queued.discard(u)
+        for v, weight in adjacency[u]:
+            if distances[u] + weight < distances[v]:
                 distances[v] = distances[u] + weight
                 parent[v] = u
-    
-    # Construct shortest path tree (SPT)
-    spt = Graph(f"{graph.title}_(bf_spt)", directed=graph.directed, weighted=graph.weighted)
-    for node, neighbor in parent.items():
-        spt.add_node(node)
-        spt.add_node(neighbor)
-        spt.add_edge(neighbor, node, graph.adj_list[neighbor][node])
+                path_edges[v] = path_edges[u] + 1
+                if path_edges[v] >= n:
+                    raise NegativeCycleError(_negative_cycle(parent, v, n))
+                if v not in queued:
+                    queued.add(v)
+                    queue.append(v)
 
-    return spt, distances
+def _negative_cycle(parent: dict, node: str, n: int) -> List[str]:
+    # Walking V parent links from a node relaxed too often always lands on the cycle
+    for _ in range(n):
+        node = parent[node]
+    cycle = [node]
+    current = parent[node]
+    while current != node:
+        cycle.append(current)
+        current = parent[current]
+    cycle.append(node)
+    return cycle[::-1]
 
 def floyd_warshall(graph: Graph) -> List[List[int]]:
     # Check for trivial graphs
@@ -86,26 +557,147 @@ def floyd_warshall(graph: Graph) -> List[List[int]]:
     elif graph.order() == 0:
         return [[]]
 
-    n = graph.order()
-    adj_matrix = graph.get_adj_matrix()
-    distances = []
-    for i in range(n):
-        row = []
-        for j in range(n):
-            if i == j:
-                row.append(0)
-            elif adj_matrix[i][j] == 0:
-                row.append(float('inf'))
-            else:
-                row.append(adj_matrix[i][j])
-        distances.append(row)
-    
+    distances, _, _ = floyd_warshall_matrix(graph)
+    rows = distances.tolist()
+    if np.issubdtype(graph.get_sparse_adj()[2].dtype, np.integer):
+        rows = [[int(value) if math.isfinite(value) else value for value in row] for row in rows]
+    return rows
+
+def floyd_warshall_matrix(graph: Graph) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    # Returns (distances, predecessors, nodes): row/column i is nodes[i] (sorted node order) and
+    # predecessors[i][j] is the node index before j on a shortest i -> j path, or -1 if there is none
+    nodes = graph.get_node_order()
+    n = len(nodes)
+    distances = graph.get_adj_array(dtype=np.float64, fill_value=np.inf)
+    np.fill_diagonal(distances, 0)
+    predecessors = np.where(np.isfinite(distances), np.arange(n)[:, None], -1)
+    np.fill_diagonal(predecessors, -1)
+
+    # Each k-step relaxes every pair through k at once
+    through_k = np.empty_like(distances)
+    improved = np.empty(distances.shape, dtype=bool)
     for k in range(n):
-        for i in range(n):
-            for j in range(n):
-                distances[i][j] = min(distances[i][j], distances[i][k] + distances[k][j])
-        
-        if distances[k][k] < 0:
-            raise ValueError("Negative cycle detected")
+        np.add(distances[:, k, None], distances[None, k, :], out=through_k)
+        np.less(through_k, distances, out=improved)
+        np.copyto(distances, through_k, where=improved)
+        np.copyto(predecessors, predecessors[k].copy(), where=improved)
+
+        negative = np.flatnonzero(np.diagonal(distances) < 0)
+        if len(negative):
+            raise NegativeCycleError(_matrix_cycle(predecessors, nodes, int(negative[0])))
+
+    return distances, predecessors, nodes
+
+def reconstruct_path(predecessors: np.ndarray, nodes: List[str], source_index: int, target_index: int) -> List[str]:
+    if source_index == target_index:
+        return [nodes[source_index]]
+    if predecessors[source_index, target_index] < 0:
+        return []
+    path = [target_index]
+    while path[-1] != source_index:
+        path.append(int(predecessors[source_index, path[-1]]))
+    return [nodes[i] for i in reversed(path)]
+
+def _matrix_cycle(predecessors: np.ndarray, nodes: List[str], i: int) -> List[str]:
+    # Follow row i's predecessors back from i until a node repeats
+    seen = {}
+    walk = []
+    j = i
+    while j not in seen and j >= 0:
+        seen[j] = len(walk)
+        walk.append(j)
+        j = int(predecessors[i, j])
+    if j < 0:
+        return []
+    cycle = walk[seen[j]:] + [j]
+    return [nodes[index] for index in reversed(cycle)]
+
 
+def johnson(graph: Graph, sources=None, workers: int=None) -> Iterator[Tuple[str, np.ndarray]]:
+    # Yields (source, distances) for each source (all nodes by default) as soon as it is ready;
+    # distances is a float64 array in sorted node order with inf for unreachable nodes.
+    # workers=None uses every core, workers=1 runs in this process.
+    frozen = graph.freeze()
+    if sources is None: sources = graph.get_node_order()
+    source_ids = [frozen.node_ids[graph.resolve_node(node)] for node in sources]
+    potentials = weights = None   # The graph's own weights unless they need reweighting
+
+    if graph.negative_weights > 0:
+        # Bellman-Ford from a virtual node joined to every node by a 0-weight edge
+        virtual_node = object()
+        adjacency = {node: list(neighbors.items()) for node, neighbors in graph.adj_list.items()}
+        adjacency[virtual_node] = [(node, 0) for node in adjacency]
+        distances = {node: float('inf') for node in adjacency}
+        distances[virtual_node] = 0
+        _spfa(adjacency, virtual_node, distances, {})
+
+        # Reweight every edge to w + h(u) - h(v) >= 0
+        potentials = np.array([distances[node] for node in frozen.node_names], dtype=np.float64)
+        weights = frozen.weights + potentials[frozen.get_sources()] - potentials[frozen.targets]
+        np.maximum(weights, 0, out=weights)   # Clamp float rounding
+
+    names = frozen.node_names
+    for source_id, distances in _distance_rows(frozen, weights, potentials, source_ids, workers):
+        yield names[source_id], distances
+
+# Worker processes receive the graph once, through the pool initializer, and keep it here
+_worker_csr = None
+
+def _init_worker(frozen, weights, potentials) -> None:
+    # frozen is a FrozenGraph, or the path of a memory-mapped one to map again in this process
+    global _worker_csr
+    if isinstance(frozen, str):
+        frozen = load_mapped(frozen)
+    _worker_csr = frozen.get_csr_views(weights) + (potentials,)
+
+def _worker_distances(source_id: int) -> np.ndarray:
+    return _csr_distances(_worker_csr, source_id)
+
+def _csr_distances(csr: tuple, source_id: int) -> np.ndarray:
+    offsets, targets, weights, potentials = csr
+    distances = [float('inf')] * (len(offsets) - 1)
+    distances[source_id] = 0
+    min_heap = [(0, source_id)]
+
+    while min_heap:
+        distance, u = heapq.heappop(min_heap)
+        if distance > distances[u]:
+            continue
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            tenative_distance = distance + weights[i]
+            if tenative_distance < distances[v]:
+                distances[v] = tenative_distance
+                heapq.heappush(min_heap, (tenative_distance, v))
+
+    distances = np.array(distances, dtype=np.float64)
+    if potentials is not None:
+        distances += potentials - potentials[source_id]   # Undo Johnson's reweighting
     return distances
+
+def _distance_rows(frozen: FrozenGraph, weights, potentials, source_ids: List[int],
+                   workers: int=None) -> Iterator[Tuple[int, np.ndarray]]:
+    # weights (None for the graph's own) and potentials are Johnson's reweighting, if any
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(source_ids) <= 1:
+        csr = frozen.get_csr_views(weights) + (potentials,)
+        for source_id in source_ids:
+            yield source_id, _csr_distances(csr, source_id)
+        return
+
+    # Keep a bounded number of sources in flight so finished rows never pile up in memory
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(frozen.mapped_path or frozen, weights, potentials))
+    try:
+        pending = deque()
+        for source_id in source_ids:
+            pending.append((source_id, executor.submit(_worker_distances, source_id)))
+            if len(pending) >= 4 * workers:
+                source_id, future = pending.popleft()
+                yield source_id, future.result()
+        while pending:
+            source_id, future = pending.popleft()
+            yield source_id, future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
@@ -4,91 +4,262 @@ traversals.py
 Provides Breadth-First Search (BFS) and Depth-First Search (DFS) algorithms for traversing graphs.
 
 Includes:
+- Lazy traversal generators that walk the adjacency rows in place (no neighbor copies)
+  - info=True yields (node, depth, parent) tuples; parent is None for the start node
+  - A FrozenGraph is walked over integer ids in its CSR arrays; names are looked up only when yielded
 - Full traversal orders from a starting node
-- Boolean search (i.e., "does a path exist to target?")
+- Boolean search (i.e., "does a path exist to target?") that stops as soon as the target is reached
 - Optional callback functions for node visitation side effects
+- Level-synchronous BFS over the CSR arrays from one or many sources, expanding a whole frontier per
+  NumPy step and switching between top-down and bottom-up expansion by frontier size
+  - Returns per-node levels and parents as arrays in get_node_order() order (-1 where unreached);
+    a source is its own parent, so following parents labels every node with its nearest source
 
 Functions:
+- iter_bfs(graph, start, info=False)
+- iter_dfs(graph, start, info=False)
 - bfs_order(graph, start, bfs_action=None)
 - bfs_contains(graph, start, target)
 - dfs_order(graph, start, dfs_action=None)
 - dfs_contains(graph, start, target)
+- bfs_levels(graph, sources, alpha=BOTTOM_UP_ALPHA, beta=TOP_DOWN_BETA)
 """
 
 
 
-from graphlib.core import Graph
-from typing import List
+import numpy as np
+from graphlib.core import Graph, FrozenGraph
+from typing import Iterator, List, Tuple
 from collections import deque
 
-def bfs_order(graph: Graph, start: str, bfs_action: str=None) -> List[str]:
-    if not graph.has_node(start):
-        raise ValueError(f"'{start}' not found in '{graph.title}'")
-    
-    visited_nodes = {start}
-    queue = deque([start])
-    traversal = []
+BOTTOM_UP_ALPHA = 14  # Go bottom-up once frontier edges exceed unvisited edges / alpha
+TOP_DOWN_BETA = 24    # Return top-down once the frontier holds fewer than order / beta nodes
 
-    while queue:
-        current = queue[0]
-        traversal.append(current)
+def iter_bfs(graph: Graph, start: str, info: bool=False) -> Iterator:
+    start = graph.resolve_node(start)
+    if isinstance(graph, FrozenGraph):
+        return _named(graph, _csr_bfs(graph.get_csr_views(), graph.node_ids[start]), info)
+    return _bfs(graph, start, info)
+
+def iter_dfs(graph: Graph, start: str, info: bool=False) -> Iterator:
+    start = graph.resolve_node(start)
+    if isinstance(graph, FrozenGraph):
+        return _named(graph, _csr_dfs(graph.get_csr_views(), graph.node_ids[start]), info)
+    return _dfs(graph, start, info)
 
+def bfs_order(graph: Graph, start: str, bfs_action: str=None) -> List[str]:
+    if isinstance(graph, FrozenGraph):
+        names = graph.node_names
+        start = graph.node_ids[graph.resolve_node(start)]
+        traversal = [names[node] for node in _csr_bfs_order(graph.get_csr_views(), start)]
         if bfs_action:
-            bfs_action(current)
+            for node in traversal: bfs_action(node)
+        return traversal
 
-        for neighbor in graph.get_neighbors(current):
-            if neighbor not in visited_nodes:
-                visited_nodes.add(neighbor)
-                queue.append(neighbor)
-        
-        queue.popleft()
+    traversal = []
+    for node in iter_bfs(graph, start):
+        traversal.append(node)
+        if bfs_action:
+            bfs_action(node)
 
     return traversal
 
 def bfs_contains(graph: Graph, start: str, target: str) -> bool:
-    found = False
+    if not graph.native_keys: target = str(target)
+    if isinstance(graph, FrozenGraph):
+        start, target = graph.node_ids[graph.resolve_node(start)], graph.node_ids.get(target)
+        return any(node == target for node, _, _ in _csr_bfs(graph.get_csr_views(), start))
+    return any(node == target for node in iter_bfs(graph, start))
+
+def dfs_order(graph: Graph, start: str, dfs_action: str=None) -> List[str]:
+    if isinstance(graph, FrozenGraph):
+        names = graph.node_names
+        start = graph.node_ids[graph.resolve_node(start)]
+        visited = bytearray(graph.order())
+        traversal = [names[node] for node in _csr_dfs_order(graph.get_csr_views(), start, visited)]
+        if dfs_action:
+            for node in traversal: dfs_action(node)
+        return traversal
+
+    traversal = []
+    for node in iter_dfs(graph, start):
+        traversal.append(node)
+        if dfs_action:
+            dfs_action(node)
 
-    def bfs_action(node: str):
-        nonlocal found
-        if node == target:
-            found = True
-            return
+    return traversal
 
-    bfs_order(graph, start, bfs_action)
-    return found
+def dfs_contains(graph: Graph, start: str, target: str) -> bool:
+    if not graph.native_keys: target = str(target)
+    if isinstance(graph, FrozenGraph):
+        start, target = graph.node_ids[graph.resolve_node(start)], graph.node_ids.get(target)
+        return any(node == target for node, _, _ in _csr_dfs(graph.get_csr_views(), start))
+    return any(node == target for node in iter_dfs(graph, start))
 
+def bfs_levels(graph: Graph, sources, alpha: float=BOTTOM_UP_ALPHA,
+               beta: float=TOP_DOWN_BETA) -> Tuple[np.ndarray, np.ndarray]:
+    frozen = graph.freeze()
+    node_index = frozen.get_node_index()
+    n = frozen.order()
+    source_ids = np.unique(np.array([node_index[graph.resolve_node(source)] for source in sources],
+                                    dtype=np.int64))
 
-def dfs_order(graph: Graph, start: str, dfs_action: str=None) -> List[str]:
-    if not graph.has_node(start):
-        raise ValueError(f"'{start}' not found in '{graph.title}'")
-    
+    levels = np.full(n, -1, dtype=np.int64)
+    parents = np.full(n, -1, dtype=np.int64)
+    levels[source_ids] = 0
+    parents[source_ids] = source_ids
+
+    # Top-down scans the frontier's out-edges, bottom-up scans the unvisited nodes' in-edges
+    offsets, targets = frozen.offsets, frozen.targets
+    reverse = frozen.reverse()
+    in_offsets, in_sources = reverse.offsets, reverse.targets
+    out_degree = np.diff(offsets)
+    in_degree = np.diff(in_offsets)
+
+    frontier = source_ids
+    unvisited_edges = int(in_degree.sum() - in_degree[frontier].sum())
+    bottom_up = False
+    level = 0
+    while len(frontier):
+        frontier_edges = int(out_degree[frontier].sum())
+        if not bottom_up and frontier_edges > unvisited_edges / alpha:
+            bottom_up = True
+        elif bottom_up and len(frontier) < n / beta:
+            bottom_up = False
+
+        if bottom_up:
+            unvisited = np.flatnonzero(levels < 0)
+            in_frontier = np.zeros(n, dtype=bool)
+            in_frontier[frontier] = True
+            neighbors, owners = _expand(in_offsets, in_sources, unvisited)
+            hit = in_frontier[neighbors]
+            found, parent = owners[hit], neighbors[hit]
+        else:
+            neighbors, owners = _expand(offsets, targets, frontier)
+            fresh = levels[neighbors] < 0
+            found, parent = neighbors[fresh], owners[fresh]
+
+        # First discovery wins, so each new node gets a single parent
+        frontier, first = np.unique(found, return_index=True)
+        level += 1
+        levels[frontier] = level
+        parents[frontier] = parent[first]
+        unvisited_edges -= int(in_degree[frontier].sum())
+
+    return levels, parents
+
+def _expand(offsets: np.ndarray, targets: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Every CSR entry in the given rows, with the row each one came from
+    starts = offsets[rows]
+    counts = offsets[rows + 1] - starts
+    total = int(counts.sum())
+    ends = np.cumsum(counts)
+    positions = np.arange(total) + np.repeat(starts - (ends - counts), counts)
+    return targets[positions], np.repeat(rows, counts)
+
+def _bfs(graph: Graph, start: str, info: bool) -> Iterator:
+    adj_list = graph.adj_list
     visited_nodes = {start}
-    stack = [start]
-    traversal = []
+    queue = deque([(start, 0, None)])
+
+    while queue:
+        current, depth, parent = queue.popleft()
+        yield (current, depth, parent) if info else current
+
+        # Expanded only once the caller asks for the next node
+        for neighbor in adj_list[current]:
+            if neighbor not in visited_nodes:
+                visited_nodes.add(neighbor)
+                queue.append((neighbor, depth + 1, current))
+
+def _dfs(graph: Graph, start: str, info: bool) -> Iterator:
+    # The stack holds (node, iterator over its remaining neighbors); a node is marked when it is first
+    # reached from the top of the stack, so depths and parents form a true DFS tree
+    adj_list = graph.adj_list
+    visited_nodes = {start}
+    yield (start, 0, None) if info else start
+    stack = [(start, iter(adj_list[start]))]
 
     while stack:
-        current  = stack[-1]
-        if current not in traversal:
-            traversal.append(current)
-            if dfs_action:
-                dfs_action(current)
-        stack.pop()
-
-        for neighbor in graph.get_neighbors(current):
+        current, neighbors = stack[-1]
+        for neighbor in neighbors:
             if neighbor not in visited_nodes:
                 visited_nodes.add(neighbor)
-                stack.append(neighbor)
+                yield (neighbor, len(stack), current) if info else neighbor
+                stack.append((neighbor, iter(adj_list[neighbor])))
+                break
+        else:
+            stack.pop()
 
-    return traversal
+def _named(graph: FrozenGraph, traversal: Iterator, info: bool) -> Iterator:
+    # Converts the (id, depth, parent id) tuples of a CSR traversal back to node names
+    names = graph.node_names
+    if not info:
+        for node, _, _ in traversal:
+            yield names[node]
+        return
+    for node, depth, parent in traversal:
+        yield names[node], depth, (names[parent] if parent >= 0 else None)
 
-def dfs_contains(graph: Graph, start: str, target: str) -> bool:
-    found = False
-    
-    def dfs_action(current):
-        nonlocal found
-        if current == target:
-            found = True
-            return
-
-    dfs_order(graph, start, dfs_action)
-    return found
\ No newline at end of file
+def _csr_bfs_order(csr: tuple, start: int) -> List[int]:
+    # Whole BFS order over integer ids; the order list doubles as the queue
+    offsets, targets, _ = csr
+    visited = bytearray(len(offsets) - 1)
+    visited[start] = 1
+    order = [start]
+    for current in order:
+        for neighbor in targets[offsets[current]:offsets[current + 1]]:
+            if not visited[neighbor]:
+                visited[neighbor] = 1
+                order.append(neighbor)
+    return order
+
+def _csr_dfs_order(csr: tuple, start: int, visited: bytearray) -> List[int]:
+    # Whole DFS preorder over integer ids: marking on pop and pushing each row reversed visits
+    # nodes in the same order as _dfs without keeping an iterator per stack entry
+    offsets, targets, _ = csr
+    order = []
+    stack = [start]
+    while stack:
+        current = stack.pop()
+        if visited[current]:
+            continue
+        visited[current] = 1
+        order.append(current)
+        stack.extend(reversed(targets[offsets[current]:offsets[current + 1]]))
+    return order
+
+def _csr_bfs(csr: tuple, start: int) -> Iterator[Tuple[int, int, int]]:
+    # _bfs over integer ids; yields (id, depth, parent id), parent -1 for the start
+    offsets, targets, _ = csr
+    visited = bytearray(len(offsets) - 1)
+    visited[start] = 1
+    queue = deque([(start, 0, -1)])
+
+    while queue:
+        entry = queue.popleft()
+        yield entry
+        current, depth = entry[0], entry[1] + 1
+        for neighbor in targets[offsets[current]:offsets[current + 1]]:
+            if not visited[neighbor]:
+                visited[neighbor] = 1
+                queue.append((neighbor, depth, current))
+
+def _csr_dfs(csr: tuple, start: int) -> Iterator[Tuple[int, int, int]]:
+    # _dfs over integer ids; yields (id, depth, parent id), parent -1 for the start
+    offsets, targets, _ = csr
+    visited = bytearray(len(offsets) - 1)
+    visited[start] = 1
+    yield start, 0, -1
+    stack = [(start, iter(targets[offsets[start]:offsets[start + 1]]))]
+
+    while stack:
+        current, neighbors = stack[-1]
+        for neighbor in neighbors:
+            if not visited[neighbor]:
+                visited[neighbor] = 1
+                yield neighbor, len(stack), current
+                stack.append((neighbor, iter(targets[offsets[neighbor]:offsets[neighbor + 1]])))
+                break
+        else:
+            stack.pop()
@@ -5,15 +5,310 @@ Provides utility functions for interacting with graph objects.
 
 Includes:
 - Writing graph summary (adjacency list, matrix, and edge list) to a formatted text file
+  - Sections are streamed to the file one line at a time and can be selected individually
+  - The adjacency matrix is skipped for graphs with more than MAX_MATRIX_ORDER nodes
+- Saving and loading graphs in a compact binary format
+- Opening a saved graph as a memory-mapped, read-only FrozenGraph that processes can share
+- Streaming delimited edge-list files (CSV/TSV/whitespace) into a Graph or FrozenGraph in chunks
+
+Binary format (little-endian, every section starts on an 8-byte boundary):
+- Magic bytes b"GRAPHLIB", uint32 format version, uint32 header length
+- JSON header with the title, flags, counts and array dtypes
+- CSR arrays: offsets (int64), targets (int32/int64) and weights (int64/float64)
+- Node table: int64 ids, or int64 byte offsets followed by the UTF-8 encoded names
+- Optional layout of the saved Graph (flagged in the header): node insertion order (int64), each
+  edge's position within its row (int64) and a mask of int weights among float weights (uint8),
+  so load() returns a Graph with the same adjacency order and weight types as the one saved
+
+Functions:
+- graph_info_file(graph, file_name=None, sections=None, max_matrix_order=MAX_MATRIX_ORDER)
+- save(graph, path)
+- load(path, frozen=False, track_components=False)
+- load_mapped(path)
+- read_edge_list(path, delimiter=None, header=False, ...)
 """
 
 
-from graphlib.core import Graph
+import json
+import mmap
+import os
+import struct
+import numpy as np
+from collections.abc import Sequence
+from graphlib.core import Graph, FrozenGraph
+
+MAX_MATRIX_ORDER = 100
+
+EDGE_CHUNK_SIZE = 1 << 22   # Bytes of raw text parsed at a time by read_edge_list
+
+MAGIC = b"GRAPHLIB"
+FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct("<8sII")
 
-def graph_info_file(graph: Graph, file_name: str=None) -> None:
+def graph_info_file(graph: Graph, file_name: str=None, sections=None,
+                    max_matrix_order: int=MAX_MATRIX_ORDER) -> None:
     if file_name == None:
         file_name = graph.title
     file_name = file_name.replace(" ", "_")  + ".txt"
 
     with open(file_name, 'w') as fd:
-        fd.write(str(graph))
\ No newline at end of file
+        for i, line in enumerate(graph.info_lines(sections, max_matrix_order)):
+            if i: fd.write("\n")
+            fd.write(line)
+
+def save(graph: Graph, path: str) -> None:
+    frozen = graph.freeze()
+    names = frozen.node_names
+
+    # Node table
+    if all(isinstance(node, str) for node in names):
+        node_kind = "str"
+        encoded = [node.encode("utf-8") for node in names]
+        name_offsets = np.zeros(len(encoded) + 1, dtype="<i8")
+        np.cumsum([len(name) for name in encoded], out=name_offsets[1:])
+        node_sections = [name_offsets.tobytes(), b"".join(encoded)]
+    elif all(type(node) is int for node in names):
+        node_kind = "int"
+        node_sections = [np.array(names, dtype="<i8").tobytes()]
+    else:
+        raise ValueError("Only graphs with str or int node keys can be saved")
+
+    arrays = [frozen.offsets.astype("<i8"), frozen.targets.astype(frozen.targets.dtype.newbyteorder("<")),
+              frozen.weights.astype(frozen.weights.dtype.newbyteorder("<"))]
+    header = json.dumps({
+        "title": frozen.title,
+        "directed": frozen.directed,
+        "weighted": frozen.weighted,
+        "native_keys": frozen.native_keys,
+        "negative_weights": frozen.negative_weights,
+        "order": frozen.order(),
+        "entries": len(frozen.targets),
+        "index_dtype": arrays[1].dtype.str,
+        "weight_dtype": arrays[2].dtype.str,
+        "node_kind": node_kind,
+        "names_size": len(node_sections[-1]) if node_kind == "str" else 0,
+        "insertion_order": frozen.insertion_order is not None,
+        "int_weights": frozen.int_weights is not None,
+    }).encode("utf-8")
+
+    layout_sections = []
+    if frozen.insertion_order is not None:
+        layout_sections += [frozen.insertion_order.astype("<i8"), frozen.row_positions.astype("<i8")]
+    if frozen.int_weights is not None:
+        layout_sections.append(frozen.int_weights.astype("u1"))
+
+    with open(path, "wb") as fd:
+        fd.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+        _write_aligned(fd, header)
+        for array in arrays:
+            _write_aligned(fd, array.tobytes())
+        for section in node_sections:
+            _write_aligned(fd, section)
+        for array in layout_sections:
+            _write_aligned(fd, array.tobytes())
+
+def load(path: str, frozen: bool=False, track_components: bool=False):
+    # One bulk read; the arrays are views into the buffer rather than per-edge Python objects.
+    # track_components is passed on to the thawed Graph (a FrozenGraph never changes, so it has no use there).
+    with open(path, "rb") as fd:
+        graph = _read_frozen(fd.read())
+    return graph if frozen else graph.thaw(track_components)
+
+def load_mapped(path: str) -> FrozenGraph:
+    # Arrays point straight into a read-only mapping of the file, so every process that opens
+    # the same file shares one copy in the page cache; node names are decoded on demand
+    with open(path, "rb") as fd:
+        buffer = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+    graph = _read_frozen(buffer, lazy_names=True)
+    graph.mapped_path = os.path.abspath(path)
+    return graph
+
+def read_edge_list(path: str, delimiter: str=None, header: bool=False, directed: bool=False,
+                   weighted: bool=False, weight_type=int, default_weight=1, comments: str="#",
+                   title: str=None, frozen: bool=False, chunk_size: int=EDGE_CHUNK_SIZE, progress=None):
+    # Each line holds "source<delimiter>destination[<delimiter>weight]"; delimiter=None splits on whitespace.
+    # About chunk_size bytes of text (or one longer line) are held at once. frozen=True collects edges into
+    # integer arrays and builds a FrozenGraph directly, which needs far less memory than adjacency dicts.
+    # progress(bytes_read, total_bytes, edges_read) is called after every chunk.
+    if title is None:
+        title = os.path.splitext(os.path.basename(path))[0]
+    graph = Graph(title, directed=directed, weighted=weighted)
+    node_ids = {}
+    id_chunks = []
+    weight_chunks = []
+
+    total_bytes = os.path.getsize(path)
+    bytes_read = 0
+    edges_read = 0
+    line_number = 0
+    skip_header = header
+
+    with open(path, "rb") as fd:
+        remainder = b""
+        while True:
+            chunk = fd.read(chunk_size)
+            bytes_read += len(chunk)
+            data = remainder + chunk
+            if chunk:
+                # Keep a trailing partial line for the next chunk; a line longer than
+                # chunk_size keeps growing in remainder until its newline arrives
+                cut = data.rfind(b"\n") + 1
+                data, remainder = data[:cut], data[cut:]
+                if not data:
+                    continue
+            elif not data:
+                break
+
+            # Split on "\n" only (splitlines() would also break names at \x0c, \x85, U+2028, ...); a chunk
+            # ends on a newline, which leaves one empty piece that is not a line
+            lines = data.decode("utf-8").split("\n")
+            if data.endswith(b"\n"):
+                lines.pop()
+
+            edges = []
+            for line in lines:
+                line_number += 1
+                line = line.rstrip("\r").strip()
+                if not line or (comments and line.startswith(comments)):
+                    continue
+                if skip_header:
+                    skip_header = False
+                    continue
+
+                fields = [field.strip() for field in line.split(delimiter)]
+                if len(fields) < 2:
+                    raise ValueError(f"{path}:{line_number}: expected at least 2 columns, got {len(fields)}")
+                if weighted:
+                    weight = default_weight
+                    if len(fields) > 2 and fields[2]:
+                        try:
+                            weight = weight_type(fields[2])
+                        except ValueError:
+                            raise ValueError(f"{path}:{line_number}: invalid weight {fields[2]!r}") from None
+                    edges.append((fields[0], fields[1], weight))
+                else:
+                    edges.append((fields[0], fields[1]))
+
+            if frozen:
+                # Intern names into dense ids and keep only compact arrays per chunk
+                ids = np.fromiter((node_ids.setdefault(node, len(node_ids)) for edge in edges for node in edge[:2]),
+                                  dtype=np.int64, count=2 * len(edges))
+                id_chunks.append(ids)
+                if weighted and edges:
+                    weight_chunks.append(np.array([edge[2] for edge in edges]))
+            else:
+                graph.add_edges_from(edges)
+
+            edges_read += len(edges)
+            if progress:
+                progress(bytes_read, total_bytes, edges_read)
+            if not chunk:
+                break
+
+    if not frozen:
+        return graph
+
+    ids = np.concatenate(id_chunks) if id_chunks else np.zeros(0, dtype=np.int64)
+    weights = np.concatenate(weight_chunks) if weight_chunks else None
+    return FrozenGraph.from_coo(list(node_ids), ids[0::2], ids[1::2], weights, title=title,
+                                directed=directed, weighted=weighted)
+
+def _write_aligned(fd, data: bytes) -> None:
+    fd.write(data)
+    fd.write(b"\0" * (-fd.tell() % 8))
+
+def _read_frozen(buffer, lazy_names: bool=False) -> FrozenGraph:
+    magic, version, header_size = _PREAMBLE.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a graphlib binary file")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported graphlib file version {version}")
+
+    position = _PREAMBLE.size
+    header = json.loads(bytes(buffer[position:position + header_size]))
+    position += header_size
+
+    def section(dtype, count):
+        nonlocal position
+        position += -position % 8
+        array = np.frombuffer(buffer, dtype=dtype, count=count, offset=position)
+        position += array.nbytes
+        return array
+
+    order = header["order"]
+    offsets = section("<i8", order + 1)
+    targets = section(header["index_dtype"], header["entries"])
+    weights = section(header["weight_dtype"], header["entries"])
+
+    if header["node_kind"] == "int":
+        node_names = _NodeTable(section("<i8", order))
+    else:
+        node_names = _NodeTable(section("<i8", order + 1), section("u1", header["names_size"]))
+    if not lazy_names:
+        node_names = list(node_names)
+
+    # Files written before the layout sections existed simply lack them
+    insertion_order = row_positions = int_weights = None
+    if header.get("insertion_order"):
+        insertion_order = section("<i8", order)
+        row_positions = section("<i8", header["entries"])
+    if header.get("int_weights"):
+        int_weights = section("u1", header["entries"]).view(bool)
+
+    return FrozenGraph(header["title"], header["directed"], header["weighted"], node_names, offsets, targets,
+                       weights, header["negative_weights"], header["native_keys"], insertion_order,
+                       row_positions, int_weights)
+
+
+class _NodeTable(Sequence):
+    # Read-only node names backed by the file's node table, decoded on access
+
+    def __init__(self, ids_or_offsets: np.ndarray, blob: np.ndarray=None):
+        self._ids_or_offsets = ids_or_offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        if self._blob is None:
+            return len(self._ids_or_offsets)
+        return len(self._ids_or_offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if self._blob is None:
+            return int(self._ids_or_offsets[i])
+        start, end = self._ids_or_offsets[i], self._ids_or_offsets[i + 1]
+        return self._blob[start:end].tobytes().decode("utf-8")
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def find(self, node) -> int:
+        # Binary search of the sorted table; -1 when node is absent
+        if self._blob is None:
+            if type(node) is not int:
+                return -1
+            i = int(np.searchsorted(self._ids_or_offsets, node))
+            return i if i < len(self._ids_or_offsets) and self._ids_or_offsets[i] == node else -1
+        if not isinstance(node, str):
+            return -1
+        # UTF-8 byte order matches str order, so the encoded names are compared without decoding
+        key = node.encode("utf-8")
+        offsets = self._ids_or_offsets
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self._blob[offsets[middle]:offsets[middle + 1]].tobytes() < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self) and self._blob[offsets[low]:offsets[low + 1]].tobytes() == key:
+            return low
+        return -1
+
+    def __iter__(self):
+        if self._blob is None:
+            return iter(self._ids_or_offsets.tolist())
+        blob = self._blob.tobytes()
+        offsets = self._ids_or_offsets.tolist()
+        return (blob[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:]))